@@ -1,39 +1,147 @@
+import atexit
+import copy
 import json
 import logging
+import logging.handlers
 import os
-from typing import Dict, List, Any, Optional
+import queue
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 
 
-class LogLevel(Enum):
+# Shared compact encoder for the JSONL hot path; like json.dumps it raises on values that are not JSON,
+# so a bad payload never turns into a record that only looks valid
+_EVENT_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+
+# str mixin so members compare equal to the plain strings stored on events
+class LogLevel(str, Enum):
     INFO = "INFO"
     WARNING = "WARNING"
     ERROR = "ERROR"
     CRITICAL = "CRITICAL"
 
 
-@dataclass
+@dataclass(frozen=True)
 class AuditEvent:
+    # Declared by hand (dataclass(slots=True) needs Python 3.10) to drop the per-event __dict__
+    __slots__ = ("timestamp", "event_type", "session_id", "tool_name", "level", "message", "metadata",
+                 "_dict_cache")
+    
     timestamp: datetime
     event_type: str
     session_id: str
     tool_name: Optional[str]
-    level: LogLevel
+    level: str
     message: str
     metadata: Dict[str, Any]
     
+    def __post_init__(self):
+        object.__setattr__(self, "_dict_cache", None)
+    
+    def _record(self) -> Dict[str, Any]:
+        # Flat record, so build it directly; metadata is shared rather than deep-copied
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "event_type": self.event_type,
+            "session_id": self.session_id,
+            "tool_name": self.tool_name,
+            "level": self.level,
+            "message": self.message,
+            "metadata": self.metadata
+        }
+    
     def to_dict(self) -> Dict[str, Any]:
-        result = asdict(self)
-        result['timestamp'] = self.timestamp.isoformat()
-        result['level'] = self.level.value
+        # Events are frozen, so the query-side fields are formatted once; each caller gets its own
+        # copy (metadata deep-copied) so one caller's edits never show up in another's results.
+        # display_time and display_message save table renderers from re-parsing the ISO timestamp
+        # and re-truncating the message on each refresh.
+        cached = self._dict_cache
+        if cached is None:
+            cached = self._record()
+            cached["display_time"] = self.timestamp.strftime("%H:%M:%S")
+            message = self.message
+            cached["display_message"] = message[:50] + "..." if len(message) > 50 else message
+            object.__setattr__(self, "_dict_cache", cached)
+        result = dict(cached)
+        result["metadata"] = copy.deepcopy(self.metadata)
         return result
+    
+    def to_json_bytes(self) -> bytes:
+        # The JSONL record stays free of display-only fields
+        return _EVENT_ENCODER.encode(self._record()).encode() + b'\n'
+
+
+class SessionCounters:
+    # Per-session tallies bumped on every tool call; slotted attributes instead of string-keyed dict lookups
+    __slots__ = ("start_time", "end_time", "tool_calls", "successful_calls", "failed_calls",
+                 "policy_violations", "total_duration")
+    
+    def __init__(self, start_time: datetime):
+        self.start_time = start_time
+        self.end_time: Optional[datetime] = None
+        self.tool_calls = 0
+        self.successful_calls = 0
+        self.failed_calls = 0
+        self.policy_violations = 0
+        self.total_duration = 0.0
+    
+    def as_dict(self) -> Dict[str, Any]:
+        metrics = {
+            "start_time": self.start_time,
+            "tool_calls": self.tool_calls,
+            "successful_calls": self.successful_calls,
+            "failed_calls": self.failed_calls,
+            "policy_violations": self.policy_violations,
+            "total_duration": self.total_duration
+        }
+        if self.end_time is not None:
+            metrics["end_time"] = self.end_time
+        return metrics
+
+
+def _drop_indexed(index: Dict[str, Deque[AuditEvent]], key: str, event: AuditEvent):
+    # Called as event falls out of its bounded store; indexes hold events oldest-first
+    entries = index.get(key)
+    if entries and entries[0] is event:
+        entries.popleft()
+        if not entries:
+            del index[key]
+
+
+def _copy_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    # The cached report is shared across callers; each gets copies of the parts it could edit
+    return {
+        **report,
+        "report_period": dict(report["report_period"]),
+        "summary": dict(report["summary"]),
+        "tool_performance": {tool: dict(metrics) for tool, metrics in report["tool_performance"].items()},
+        "recent_violations": [{**v, "metadata": dict(v["metadata"])} for v in report["recent_violations"]],
+        "violations": list(report["violations"])
+    }
+
+
+def _close_at_exit(close_ref: "weakref.WeakMethod"):
+    close = close_ref()
+    if close is not None:
+        close()
+
+
+# Queue sentinel telling the background writer to drain and exit
+_WRITER_STOP = object()
 
 
 class AuditMonitor:
-    def __init__(self, log_dir: str = "audit_logs"):
+    def __init__(self, log_dir: str = "audit_logs", async_logging: bool = False,
+                 retention_days: Optional[int] = None):
         # Make log directory absolute relative to this file's directory
         if not os.path.isabs(log_dir):
             log_dir = os.path.join(os.path.dirname(__file__), log_dir)
@@ -44,91 +152,102 @@ class AuditMonitor:
         self.logger = logging.getLogger("audit_monitor")
         self.logger.setLevel(logging.INFO)
         
-        # Create file handler for audit logs
-        log_file = self.log_dir / f"audit_{datetime.now().strftime('%Y%m%d')}.log"
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.INFO)
-        
-        # Create console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # Add handlers to logger
+        # The JSONL stream is the structured record, so the logger only feeds the console.
+        # Records go through a queue and are written to stderr by a background listener.
+        self._log_handler: Optional[logging.handlers.QueueHandler] = None
+        self._log_listener: Optional[logging.handlers.QueueListener] = None
         if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
-        
-        # In-memory storage for real-time monitoring
-        self.events: List[AuditEvent] = []
-        self.session_metrics: Dict[str, Dict[str, Any]] = {}
-        
-        # Performance tracking
-        self.tool_performance: Dict[str, List[float]] = {}
-        self.policy_violations: List[AuditEvent] = []
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            ))
+            log_queue: queue.Queue = queue.Queue(-1)
+            self._log_handler = logging.handlers.QueueHandler(log_queue)
+            self.logger.addHandler(self._log_handler)
+            self._log_listener = logging.handlers.QueueListener(log_queue, console_handler)
+            self._log_listener.start()
+        
+        # In-memory storage for real-time monitoring (bounded, oldest events fall off)
+        self.events: Deque[AuditEvent] = deque(maxlen=10000)
+        self.session_metrics: Dict[str, SessionCounters] = {}
+        
+        # Performance tracking: running count/sum/min/max per tool instead of every duration
+        self.tool_perf_agg: Dict[str, Dict[str, float]] = {}
+        self.policy_violations: Deque[AuditEvent] = deque(maxlen=50000)
+        
+        # Secondary indexes so filtered queries only touch matching events. They mirror the bounded
+        # stores above: an event leaves its index when it leaves the store, and empty keys are dropped
+        self._by_session: Dict[str, Deque[AuditEvent]] = defaultdict(lambda: deque(maxlen=10000))
+        self._by_type: Dict[str, Deque[AuditEvent]] = defaultdict(lambda: deque(maxlen=10000))
+        self._violations_by_session: Dict[str, Deque[AuditEvent]] = defaultdict(lambda: deque(maxlen=10000))
+        
+        # Short-lived cache of compliance reports, dropped whenever a new event is recorded
+        self._report_cache: Dict[Optional[str], Tuple[float, Dict[str, Any]]] = {}
+        self._report_cache_ttl = 5.0
+        self._report_version = 0
+        self._report_lock = threading.Lock()
         
         # Load existing audit data from files
         self._load_existing_audit_data()
+        
+        # Long-lived O_APPEND descriptor for the JSONL event stream, reopened on date change.
+        # Each batch goes out in one unbuffered write, so processes sharing log_dir never interleave lines.
+        self._io_lock = threading.Lock()
+        self._event_fd: Optional[int] = None
+        self._event_fd_date: Optional[str] = None
+        # Closes the descriptor; runs on close(), a reopen, or when the monitor is collected unclosed
+        self._fd_finalizer: Optional[weakref.finalize] = None
+        
+        # Current date string, recomputed only once the clock passes the next local midnight
+        self._date_str = ""
+        self._next_rollover = 0.0
+        self._closed = False
+        self._io_closed = False
+        
+        # Optional background writer that keeps disk I/O off the caller's thread
+        self.async_logging = async_logging
+        self.dropped_events = 0
+        self._event_q: Optional[queue.Queue] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        
+        if async_logging:
+            self._event_q = queue.Queue(maxsize=20000)
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, name="audit-writer", daemon=True
+            )
+            self._writer_thread.start()
+        # Weak, so the exit hook does not keep every monitor (and its buffers and fd) alive
+        atexit.register(_close_at_exit, weakref.WeakMethod(self.close))
+        
+        # Drop event files past the retention window; repeated at each daily rollover
+        if retention_days is None:
+            retention_days = int(os.environ.get("AUDIT_RETENTION_DAYS", "30"))
+        self.retention_days = retention_days
+        self._rotate_event_files()
     
     def _load_existing_audit_data(self):
         """Load existing audit data from JSONL files to restore session metrics."""
+        # Only these event types affect restored state; everything else is skipped unparsed
+        handlers = {
+            'session_start': self._replay_session_start,
+            'tool_call_attempt': self._replay_tool_call_attempt,
+            'tool_call_completion': self._replay_tool_call_completion,
+            'policy_violation': self._replay_policy_violation
+        }
+        
         try:
             events_file = self.log_dir / f"events_{datetime.now().strftime('%Y%m%d')}.jsonl"
             if not events_file.exists():
                 return
             
-            with open(events_file, 'r') as f:
+            with open(events_file, 'rb') as f:
                 for line in f:
                     try:
-                        event_data = json.loads(line.strip())
-                        event_type = event_data.get('event_type')
-                        session_id = event_data.get('session_id')
-                        
-                        # Reconstruct session metrics from events
-                        if event_type == 'session_start':
-                            if session_id not in self.session_metrics:
-                                self.session_metrics[session_id] = {
-                                    "start_time": datetime.fromisoformat(event_data['timestamp']),
-                                    "tool_calls": 0,
-                                    "successful_calls": 0,
-                                    "failed_calls": 0,
-                                    "policy_violations": 0,
-                                    "total_duration": 0.0
-                                }
-                        
-                        elif event_type == 'tool_call_attempt':
-                            if session_id in self.session_metrics:
-                                self.session_metrics[session_id]["tool_calls"] += 1
-                        
-                        elif event_type == 'tool_call_completion':
-                            if session_id in self.session_metrics:
-                                success = event_data.get('metadata', {}).get('success', False)
-                                if success:
-                                    self.session_metrics[session_id]["successful_calls"] += 1
-                                else:
-                                    self.session_metrics[session_id]["failed_calls"] += 1
-                        
-                        elif event_type == 'policy_violation':
-                            if session_id in self.session_metrics:
-                                self.session_metrics[session_id]["policy_violations"] += 1
-                            
-                            # Reconstruct policy violation event
-                            violation_event = AuditEvent(
-                                timestamp=datetime.fromisoformat(event_data['timestamp']),
-                                event_type=event_type,
-                                session_id=session_id,
-                                tool_name=event_data.get('tool_name'),
-                                level=LogLevel(event_data.get('level')),
-                                message=event_data.get('message'),
-                                metadata=event_data.get('metadata', {})
-                            )
-                            self.policy_violations.append(violation_event)
+                        event_data = json.loads(line)
+                        handler = handlers.get(event_data.get('event_type'))
+                        if handler is not None:
+                            handler(event_data)
                             
                     except (json.JSONDecodeError, ValueError, KeyError) as e:
                         # Skip malformed lines but log the error
@@ -140,40 +259,220 @@ class AuditMonitor:
         except Exception as e:
             self.logger.error(f"Error loading existing audit data: {e}")
     
+    def _replay_session_start(self, event_data: Dict[str, Any]):
+        session_id = event_data.get('session_id')
+        if session_id not in self.session_metrics:
+            self.session_metrics[session_id] = SessionCounters(datetime.fromisoformat(event_data['timestamp']))
+    
+    def _replay_tool_call_attempt(self, event_data: Dict[str, Any]):
+        metrics = self.session_metrics.get(event_data.get('session_id'))
+        if metrics is not None:
+            metrics.tool_calls += 1
+    
+    def _replay_tool_call_completion(self, event_data: Dict[str, Any]):
+        metrics = self.session_metrics.get(event_data.get('session_id'))
+        if metrics is not None:
+            if event_data.get('metadata', {}).get('success', False):
+                metrics.successful_calls += 1
+            else:
+                metrics.failed_calls += 1
+    
+    def _replay_policy_violation(self, event_data: Dict[str, Any]):
+        session_id = event_data.get('session_id')
+        metrics = self.session_metrics.get(session_id)
+        if metrics is not None:
+            metrics.policy_violations += 1
+        
+        # Violations are the only events kept in memory, so only they are rebuilt
+        self._record_violation(AuditEvent(
+            timestamp=datetime.fromisoformat(event_data['timestamp']),
+            event_type='policy_violation',
+            session_id=session_id,
+            tool_name=event_data.get('tool_name'),
+            level=event_data.get('level'),
+            message=event_data.get('message'),
+            metadata=event_data.get('metadata', {})
+        ))
+    
     def _create_event(self, event_type: str, session_id: str, tool_name: Optional[str], 
-                     level: LogLevel, message: str, metadata: Dict[str, Any] = None) -> AuditEvent:
+                     level: LogLevel, message: str, metadata: Dict[str, Any] = None,
+                     timestamp: Optional[datetime] = None) -> AuditEvent:
         if metadata is None:
             metadata = {}
         
+        # Day rollover and retention pruning happen here on the caller's thread, before this event
+        # is recorded, so the write path never emits events or touches the in-memory stores
+        self._check_rollover()
+        
         event = AuditEvent(
-            timestamp=datetime.now(),
+            timestamp=timestamp or datetime.now(),
             event_type=event_type,
             session_id=session_id,
             tool_name=tool_name,
-            level=level,
+            level=level.value,
             message=message,
             metadata=metadata
         )
         
-        self.events.append(event)
+        events = self.events
+        if len(events) == events.maxlen:
+            oldest = events[0]
+            _drop_indexed(self._by_session, oldest.session_id, oldest)
+            _drop_indexed(self._by_type, oldest.event_type, oldest)
+        events.append(event)
+        self._by_session[session_id].append(event)
+        self._by_type[event_type].append(event)
+        self._invalidate_report_cache()
         self._write_event_to_file(event)
         
         return event
     
+    def _invalidate_report_cache(self):
+        with self._report_lock:
+            self._report_version += 1
+            self._report_cache.clear()
+    
+    def _record_violation(self, event: AuditEvent):
+        violations = self.policy_violations
+        if len(violations) == violations.maxlen:
+            oldest = violations[0]
+            _drop_indexed(self._violations_by_session, oldest.session_id, oldest)
+        violations.append(event)
+        self._violations_by_session[event.session_id].append(event)
+    
     def _write_event_to_file(self, event: AuditEvent):
-        event_file = self.log_dir / f"events_{datetime.now().strftime('%Y%m%d')}.jsonl"
-        with open(event_file, 'a') as f:
-            f.write(json.dumps(event.to_dict()) + '\n')
+        if self._closed:
+            return
+        
+        # Serialized on the caller's thread, so the record reflects the metadata as it was when logged
+        # and the writer thread never touches caller-owned dicts; the date picks the day's file
+        record = (self._date_str, event.to_json_bytes())
+        
+        if self._event_q is not None:
+            try:
+                self._event_q.put_nowait(record)
+            except queue.Full:
+                # Never block a tool call on the audit trail; count what we lose and say so
+                self.dropped_events += 1
+                if self.dropped_events == 1 or self.dropped_events % 1000 == 0:
+                    self.logger.error(f"Audit queue full; {self.dropped_events} events dropped so far")
+            return
+        
+        self._append_records([record])
+    
+    def _check_rollover(self):
+        now = time.time()
+        if now >= self._next_rollover:
+            today = datetime.fromtimestamp(now)
+            midnight = today.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+            previous = self._date_str
+            self._date_str = today.strftime('%Y%m%d')
+            self._next_rollover = midnight.timestamp()
+            # The rotation event goes through _create_event; the rollover is already recorded, so it does not recurse
+            if previous and previous != self._date_str:
+                self._rotate_event_files()
+    
+    def _rotate_event_files(self):
+        if self.retention_days <= 0:
+            return
+        
+        today = datetime.now().date()
+        removed = []
+        for path in self.log_dir.glob("events_*.jsonl"):
+            try:
+                file_date = datetime.strptime(path.stem[7:], '%Y%m%d').date()
+            except ValueError:
+                continue
+            if (today - file_date).days > self.retention_days:
+                try:
+                    path.unlink()
+                    removed.append(path.name)
+                except OSError as e:
+                    self.logger.error(f"Error removing expired audit file {path.name}: {e}")
+        
+        if removed:
+            self._create_event(
+                "log_rotation",
+                "system",
+                None,
+                LogLevel.INFO,
+                f"Removed {len(removed)} audit files older than {self.retention_days} days",
+                {"removed_files": removed, "retention_days": self.retention_days}
+            )
+    
+    def _append_records(self, records: List[Tuple[str, bytes]]):
+        # Consecutive records for the same day go out in one write
+        with self._io_lock:
+            if self._io_closed:
+                return
+            start = 0
+            while start < len(records):
+                date_str = records[start][0]
+                end = start + 1
+                while end < len(records) and records[end][0] == date_str:
+                    end += 1
+                if date_str != self._event_fd_date:
+                    self._open_event_file(date_str)
+                data = memoryview(b''.join(record for _, record in records[start:end]))
+                while data:
+                    written = os.write(self._event_fd, data)
+                    data = data[written:]
+                start = end
+    
+    def _writer_loop(self):
+        while True:
+            batch = [self._event_q.get()]
+            while len(batch) < 256:
+                try:
+                    batch.append(self._event_q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = any(record is _WRITER_STOP for record in batch)
+            records = [record for record in batch if record is not _WRITER_STOP]
+            if records:
+                try:
+                    self._append_records(records)
+                except Exception as e:
+                    self.logger.error(f"Audit writer failed to persist {len(records)} events: {e}")
+            if stop:
+                return
+    
+    def _open_event_file(self, date_str: str):
+        path = os.path.join(str(self.log_dir), f"events_{date_str}.jsonl")
+        if self._event_fd is not None:
+            self._fd_finalizer()
+        self._event_fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._fd_finalizer = weakref.finalize(self, os.close, self._event_fd)
+        # At interpreter exit close() runs instead, after the writer has drained
+        self._fd_finalizer.atexit = False
+        self._event_fd_date = date_str
+    
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        
+        # Let the background writer drain whatever is still queued
+        if self._writer_thread is not None:
+            self._event_q.put(_WRITER_STOP)
+            self._writer_thread.join()
+        
+        with self._io_lock:
+            self._io_closed = True
+            if self._event_fd is not None:
+                self._fd_finalizer()
+                self._event_fd = None
+        
+        # Only the monitor that installed the console listener tears it down
+        if self._log_listener is not None:
+            self.logger.removeHandler(self._log_handler)
+            self._log_listener.stop()
+            self._log_listener = None
     
     def log_session_start(self, session_id: str, metadata: Dict[str, Any] = None):
-        self.session_metrics[session_id] = {
-            "start_time": datetime.now(),
-            "tool_calls": 0,
-            "successful_calls": 0,
-            "failed_calls": 0,
-            "policy_violations": 0,
-            "total_duration": 0.0
-        }
+        now = datetime.now()
+        self.session_metrics[session_id] = SessionCounters(now)
         
         event = self._create_event(
             "session_start",
@@ -181,16 +480,18 @@ class AuditMonitor:
             None,
             LogLevel.INFO,
             f"Session {session_id} started",
-            metadata or {}
+            metadata or {},
+            timestamp=now
         )
         
-        self.logger.info(f"Session {session_id} started")
+        self.logger.debug("Session %s started", session_id)
     
     def log_session_end(self, session_id: str, metadata: Dict[str, Any] = None):
-        if session_id in self.session_metrics:
-            metrics = self.session_metrics[session_id]
-            metrics["end_time"] = datetime.now()
-            metrics["total_duration"] = (metrics["end_time"] - metrics["start_time"]).total_seconds()
+        now = datetime.now()
+        metrics = self.session_metrics.get(session_id)
+        if metrics is not None:
+            metrics.end_time = now
+            metrics.total_duration = (now - metrics.start_time).total_seconds()
         
         event = self._create_event(
             "session_end",
@@ -198,14 +499,16 @@ class AuditMonitor:
             None,
             LogLevel.INFO,
             f"Session {session_id} ended",
-            metadata or {}
+            metadata or {},
+            timestamp=now
         )
         
-        self.logger.info(f"Session {session_id} ended")
+        self.logger.debug("Session %s ended", session_id)
     
     def log_tool_call_attempt(self, session_id: str, tool_name: str, arguments: Dict[str, Any]):
-        if session_id in self.session_metrics:
-            self.session_metrics[session_id]["tool_calls"] += 1
+        metrics = self.session_metrics.get(session_id)
+        if metrics is not None:
+            metrics.tool_calls += 1
         
         event = self._create_event(
             "tool_call_attempt",
@@ -213,33 +516,39 @@ class AuditMonitor:
             tool_name,
             LogLevel.INFO,
             f"Attempting to call tool {tool_name}",
-            {"arguments": arguments, "attempt_time": datetime.now().isoformat()}
+            {"arguments": arguments}
         )
         
-        self.logger.info(f"Session {session_id}: Attempting tool call {tool_name}")
+        self.logger.debug("Session %s: Attempting tool call %s", session_id, tool_name)
     
     def log_tool_call_completion(self, session_id: str, tool_name: str, result: Any, 
                                 success: bool, error: Optional[str] = None, 
                                 duration: Optional[float] = None):
-        if session_id in self.session_metrics:
+        metrics = self.session_metrics.get(session_id)
+        if metrics is not None:
             if success:
-                self.session_metrics[session_id]["successful_calls"] += 1
+                metrics.successful_calls += 1
             else:
-                self.session_metrics[session_id]["failed_calls"] += 1
+                metrics.failed_calls += 1
         
         # Track performance metrics
         if duration and tool_name:
-            if tool_name not in self.tool_performance:
-                self.tool_performance[tool_name] = []
-            self.tool_performance[tool_name].append(duration)
+            agg = self.tool_perf_agg.get(tool_name)
+            if agg is None:
+                agg = self.tool_perf_agg[tool_name] = {
+                    "count": 0, "sum": 0.0, "min": float("inf"), "max": float("-inf")
+                }
+            agg["count"] += 1
+            agg["sum"] += duration
+            if duration < agg["min"]:
+                agg["min"] = duration
+            if duration > agg["max"]:
+                agg["max"] = duration
         
         level = LogLevel.INFO if success else LogLevel.ERROR
         message = f"Tool {tool_name} {'completed successfully' if success else 'failed'}"
         
-        metadata = {
-            "success": success,
-            "completion_time": datetime.now().isoformat()
-        }
+        metadata = {"success": success}
         
         if result is not None:
             metadata["result"] = result
@@ -257,18 +566,18 @@ class AuditMonitor:
             metadata
         )
         
-        log_message = f"Session {session_id}: Tool {tool_name} {'completed' if success else 'failed'}"
-        if duration:
-            log_message += f" in {duration:.2f}s"
-        
         if success:
-            self.logger.info(log_message)
+            self.logger.debug("Session %s: Tool %s completed", session_id, tool_name)
         else:
+            log_message = f"Session {session_id}: Tool {tool_name} failed"
+            if duration:
+                log_message += f" in {duration:.2f}s"
             self.logger.error(f"{log_message} - Error: {error}")
     
     def log_policy_violation(self, session_id: str, tool_name: str, violation_reason: str):
-        if session_id in self.session_metrics:
-            self.session_metrics[session_id]["policy_violations"] += 1
+        metrics = self.session_metrics.get(session_id)
+        if metrics is not None:
+            metrics.policy_violations += 1
         
         event = self._create_event(
             "policy_violation",
@@ -279,7 +588,7 @@ class AuditMonitor:
             {"violation_reason": violation_reason}
         )
         
-        self.policy_violations.append(event)
+        self._record_violation(event)
         self.logger.warning(f"Session {session_id}: Policy violation - {tool_name}: {violation_reason}")
     
     def log_approval_request(self, session_id: str, tool_name: str, arguments: Dict[str, Any]):
@@ -292,7 +601,7 @@ class AuditMonitor:
             {"arguments": arguments}
         )
         
-        self.logger.info(f"Session {session_id}: Manual approval requested for {tool_name}")
+        self.logger.debug("Session %s: Manual approval requested for %s", session_id, tool_name)
     
     def log_approval_response(self, session_id: str, tool_name: str, approved: bool, 
                              approver: Optional[str] = None):
@@ -305,113 +614,154 @@ class AuditMonitor:
             {"approved": approved, "approver": approver}
         )
         
-        self.logger.info(f"Session {session_id}: Approval {'granted' if approved else 'denied'} for {tool_name}")
+        self.logger.debug("Session %s: Approval %s for %s", session_id, 'granted' if approved else 'denied', tool_name)
     
     def get_session_metrics(self, session_id: str) -> Dict[str, Any]:
-        if session_id not in self.session_metrics:
+        counters = self.session_metrics.get(session_id)
+        if counters is None:
             return {}
         
-        metrics = self.session_metrics[session_id].copy()
+        metrics = counters.as_dict()
         
         # Calculate additional metrics
-        if "start_time" in metrics:
-            if "end_time" not in metrics:
-                metrics["duration_seconds"] = (datetime.now() - metrics["start_time"]).total_seconds()
-            else:
-                metrics["duration_seconds"] = metrics["total_duration"]
+        if counters.end_time is None:
+            metrics["duration_seconds"] = (datetime.now() - counters.start_time).total_seconds()
+        else:
+            metrics["duration_seconds"] = counters.total_duration
         
         # Success rate
-        total_calls = metrics.get("tool_calls", 0)
+        total_calls = counters.tool_calls
         if total_calls > 0:
-            metrics["success_rate"] = metrics.get("successful_calls", 0) / total_calls
+            metrics["success_rate"] = counters.successful_calls / total_calls
         else:
             metrics["success_rate"] = 0.0
         
         return metrics
     
+    def _perf_summary(self, agg: Dict[str, float]) -> Dict[str, Any]:
+        count = agg["count"]
+        return {
+            "call_count": count,
+            "avg_duration": agg["sum"] / count if count else 0,
+            "min_duration": agg["min"] if count else 0,
+            "max_duration": agg["max"] if count else 0,
+            "total_duration": agg["sum"]
+        }
+    
     def get_tool_performance_metrics(self, tool_name: Optional[str] = None) -> Dict[str, Any]:
         if tool_name:
-            if tool_name not in self.tool_performance:
+            if tool_name not in self.tool_perf_agg:
                 return {}
             
-            durations = self.tool_performance[tool_name]
-            return {
-                "tool_name": tool_name,
-                "call_count": len(durations),
-                "avg_duration": sum(durations) / len(durations) if durations else 0,
-                "min_duration": min(durations) if durations else 0,
-                "max_duration": max(durations) if durations else 0,
-                "total_duration": sum(durations)
-            }
+            return {"tool_name": tool_name, **self._perf_summary(self.tool_perf_agg[tool_name])}
         
         # Return metrics for all tools
-        metrics = {}
-        for tool, durations in self.tool_performance.items():
-            metrics[tool] = {
-                "call_count": len(durations),
-                "avg_duration": sum(durations) / len(durations) if durations else 0,
-                "min_duration": min(durations) if durations else 0,
-                "max_duration": max(durations) if durations else 0,
-                "total_duration": sum(durations)
-            }
-        
-        return metrics
+        return {tool: self._perf_summary(agg) for tool, agg in self.tool_perf_agg.items()}
     
     def get_policy_violations(self, session_id: Optional[str] = None, 
-                             since: Optional[datetime] = None) -> List[Dict[str, Any]]:
-        violations = self.policy_violations
-        
+                             since: Optional[datetime] = None,
+                             limit: Optional[int] = None) -> List[Dict[str, Any]]:
         if session_id:
-            violations = [v for v in violations if v.session_id == session_id]
+            violations = self._violations_by_session.get(session_id, ())
+        else:
+            violations = self.policy_violations
         
+        # Filter lazily so only the violations we return get serialized
         if since:
-            violations = [v for v in violations if v.timestamp >= since]
+            violations = (v for v in violations if v.timestamp >= since)
+        if limit:
+            violations = islice(violations, limit)
         
         return [v.to_dict() for v in violations]
     
     def get_recent_events(self, session_id: Optional[str] = None, 
                          event_type: Optional[str] = None,
                          limit: int = 100) -> List[Dict[str, Any]]:
-        events = self.events
-        
+        # Start from the most selective index, then filter on whatever is left
         if session_id:
-            events = [e for e in events if e.session_id == session_id]
+            source = self._by_session.get(session_id, ())
+        elif event_type:
+            source = self._by_type.get(event_type, ())
+        else:
+            source = self.events
         
-        if event_type:
-            events = [e for e in events if e.event_type == event_type]
+        # Events are appended in chronological order, so newest-first is a reverse walk
+        events = reversed(source)
         
-        # Sort by timestamp descending and limit
-        events = sorted(events, key=lambda e: e.timestamp, reverse=True)[:limit]
+        if session_id and event_type:
+            events = (e for e in events if e.event_type == event_type)
         
-        return [e.to_dict() for e in events]
+        return [e.to_dict() for e in islice(events, limit)]
+    
+    def snapshot(self, session_id: Optional[str] = None, recent_limit: int = 5,
+                 violation_limit: Optional[int] = None) -> Dict[str, Any]:
+        # Recent events, violations and tool metrics in one call for dashboards that show all three
+        if session_id:
+            violations = self._violations_by_session.get(session_id, ())
+        else:
+            violations = self.policy_violations
+        
+        # Keep only the newest violations, still in chronological order
+        if violation_limit:
+            violations = list(islice(reversed(violations), violation_limit))
+            violations.reverse()
+        
+        return {
+            "recent": self.get_recent_events(session_id, limit=recent_limit),
+            "violations": [v.to_dict() for v in violations],
+            "metrics": self.get_tool_performance_metrics()
+        }
     
     def generate_compliance_report(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        with self._report_lock:
+            cached = self._report_cache.get(session_id)
+            if cached and time.monotonic() - cached[0] < self._report_cache_ttl:
+                return _copy_report(cached[1])
+            version = self._report_version
+        
+        report = self._build_compliance_report(session_id)
+        
+        # Only cache if no event arrived while the report was being built
+        with self._report_lock:
+            if version == self._report_version:
+                self._report_cache[session_id] = (time.monotonic(), report)
+        return _copy_report(report)
+    
+    def _build_compliance_report(self, session_id: Optional[str] = None) -> Dict[str, Any]:
         now = datetime.now()
         day_ago = now - timedelta(days=1)
         
         # Filter events for the report period
-        events = self.events
         if session_id:
-            events = [e for e in events if e.session_id == session_id]
+            events = self._by_session.get(session_id, ())
+            violations = self._violations_by_session.get(session_id, ())
+        else:
+            events = self.events
+            violations = self.policy_violations
         
         recent_events = [e for e in events if e.timestamp >= day_ago]
         
         # Calculate metrics from session_metrics (more accurate)
         if session_id:
             # Report for specific session
-            session_metrics = self.session_metrics.get(session_id, {})
-            total_sessions = 1 if session_id in self.session_metrics else 0
-            tool_calls = session_metrics.get("tool_calls", 0)
-            successful_calls = session_metrics.get("successful_calls", 0)
-            failed_calls = session_metrics.get("failed_calls", 0)
-            policy_violations = session_metrics.get("policy_violations", 0)
+            session_metrics = self.session_metrics.get(session_id)
+            if session_metrics is not None:
+                total_sessions = 1
+                tool_calls = session_metrics.tool_calls
+                successful_calls = session_metrics.successful_calls
+                failed_calls = session_metrics.failed_calls
+                policy_violations = session_metrics.policy_violations
+            else:
+                total_sessions = tool_calls = successful_calls = failed_calls = policy_violations = 0
         else:
             # Report for all sessions
             total_sessions = len(self.session_metrics)
-            tool_calls = sum(metrics.get("tool_calls", 0) for metrics in self.session_metrics.values())
-            successful_calls = sum(metrics.get("successful_calls", 0) for metrics in self.session_metrics.values())
-            failed_calls = sum(metrics.get("failed_calls", 0) for metrics in self.session_metrics.values())
-            policy_violations = sum(metrics.get("policy_violations", 0) for metrics in self.session_metrics.values())
+            tool_calls = successful_calls = failed_calls = policy_violations = 0
+            for metrics in self.session_metrics.values():
+                tool_calls += metrics.tool_calls
+                successful_calls += metrics.successful_calls
+                failed_calls += metrics.failed_calls
+                policy_violations += metrics.policy_violations
         
         # Calculate success rate
         success_rate = successful_calls / tool_calls if tool_calls > 0 else 0.0
@@ -435,6 +785,6 @@ class AuditMonitor:
                 "compliance_score": max(0, 100 - (policy_violations * 10))  # Simple scoring
             },
             "tool_performance": self.get_tool_performance_metrics(),
-            "recent_violations": self.get_policy_violations(session_id, day_ago),
-            "violations": [f"Session {v.session_id}: {v.metadata.get('violation_reason', 'Unknown violation')}" for v in self.policy_violations if not session_id or v.session_id == session_id]
+            "recent_violations": self.get_policy_violations(session_id, day_ago, limit=100),
+            "violations": [f"Session {v.session_id}: {v.metadata.get('violation_reason', 'Unknown violation')}" for v in violations]
         }
\ No newline at end of file
@@ -1,7 +1,11 @@
 import asyncio
+import io
+import itertools
 import json
 import logging
-from typing import Dict, Any, List
+import os
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
@@ -16,16 +20,50 @@ from orchestrator import MCPOrchestrator
 from workflow_templates import WorkflowTemplateManager
 
 
+# Shared pretty-printer for demo payloads; str() fallback so records with dates or decimals still render
+_PRETTY_ENCODER = json.JSONEncoder(indent=2, default=str)
+
+
+def _pretty(data: Any) -> str:
+    return _PRETTY_ENCODER.encode(data)
+
+
+# Sequence suffix so demo sessions started within the same second still get distinct ids
+_session_seq = itertools.count(1)
+
+
+def _session_id(tag: str) -> str:
+    return f"demo_{tag}_{time.strftime('%Y%m%d_%H%M%S')}_{next(_session_seq):04d}"
+
+
+# Every 10-cell progress bar, indexed by the number of filled cells
+_PROGRESS_BARS = ["█" * filled + "░" * (10 - filled) for filled in range(11)]
+
+# Console for the demo running in the current task; set while demos run concurrently
+_demo_console: ContextVar[Optional[Console]] = ContextVar("demo_console", default=None)
+
+
 class WorkflowDemo:
     def __init__(self):
-        self.console = Console()
+        self._console = Console()
         self.orchestrator = MCPOrchestrator()
         self.template_manager = WorkflowTemplateManager()
         self.logger = logging.getLogger(__name__)
         
+        # Seconds of pause between demo steps for visual effect; DEMO_PACE=0 runs flat out
+        self._demo_pace = float(os.getenv("DEMO_PACE", "0.5"))
+        
         # Setup logging
         logging.basicConfig(level=logging.INFO)
     
+    async def _pause(self, steps: float = 1.0):
+        if self._demo_pace:
+            await asyncio.sleep(self._demo_pace * steps)
+    
+    @property
+    def console(self) -> Console:
+        return _demo_console.get() or self._console
+    
     def print_header(self, title: str):
         self.console.print(Panel(
             Text(title, style="bold cyan"),
@@ -33,11 +71,32 @@ class WorkflowDemo:
             padding=(1, 2)
         ))
     
-    def print_workflow_status(self, session_id: str, workflow_name: str = None):
+    def _dependency_waves(self, template) -> List[List[Any]]:
+        # Group steps into waves whose dependencies were all satisfied by earlier waves,
+        # so every step in a wave can be called concurrently
+        remaining = list(template.steps)
+        scheduled = set()
+        waves = []
+        
+        while remaining:
+            wave = [step for step in remaining if all(dep in scheduled for dep in step.dependencies)]
+            if not wave:
+                # Unresolvable dependencies; fall back to declared order and let the policy engine decide
+                waves.extend([step] for step in remaining)
+                break
+            waves.append(wave)
+            scheduled.update(step.tool_name for step in wave)
+            remaining = [step for step in remaining if step.tool_name not in scheduled]
+        
+        return waves
+    
+    def print_workflow_status(self, session_id: str, workflow_name: str = None, template=None):
         session_status = self.orchestrator.get_session_status(session_id)
         
         if workflow_name:
-            template = self.template_manager.get_template(workflow_name)
+            # Callers that already hold the template pass it in instead of looking it up again
+            if template is None:
+                template = self.template_manager.get_template(workflow_name)
             if template:
                 progress = template.get_progress(
                     session_status["completed_tools"],
@@ -45,7 +104,7 @@ class WorkflowDemo:
                 )
                 
                 # Create progress bar
-                progress_bar = "█" * int(progress["progress_percent"] / 10) + "░" * (10 - int(progress["progress_percent"] / 10))
+                progress_bar = _PROGRESS_BARS[int(progress["progress_percent"] / 10)]
                 
                 status_table = Table(title=f"Workflow Status: {workflow_name}")
                 status_table.add_column("Metric", style="cyan")
@@ -69,12 +128,12 @@ class WorkflowDemo:
             events_table.add_column("Message", style="white")
             
             for event in recent_events:
-                timestamp = datetime.fromisoformat(event["timestamp"]).strftime("%H:%M:%S")
+                timestamp = event.get("display_time") or datetime.fromisoformat(event["timestamp"]).strftime("%H:%M:%S")
                 events_table.add_row(
                     timestamp,
                     event["event_type"],
                     event.get("tool_name", ""),
-                    event["message"][:50] + "..." if len(event["message"]) > 50 else event["message"]
+                    event["display_message"]
                 )
             
             self.console.print(events_table)
@@ -82,7 +141,7 @@ class WorkflowDemo:
     async def demo_successful_workflow(self):
         self.print_header("Demo 1: Successful Customer Onboarding Workflow")
         
-        session_id = f"demo_success_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        session_id = _session_id("success")
         workflow_name = "customer_onboarding"
         
         # Sample customer data
@@ -94,7 +153,7 @@ class WorkflowDemo:
         }
         
         self.console.print(f"[bold]Starting workflow: {workflow_name}[/bold]")
-        self.console.print(f"Customer data: {json.dumps(customer_data, indent=2)}")
+        self.console.print(f"Customer data: {_pretty(customer_data)}")
         
         # Get workflow template
         template = self.template_manager.get_template(workflow_name)
@@ -113,34 +172,34 @@ class WorkflowDemo:
             
             workflow_task = progress.add_task("Executing workflow...", total=len(template.steps))
             
-            for step in template.steps:
-                step_task = progress.add_task(f"Executing {step.tool_name}...", total=1)
-                
-                # Execute the tool
-                result = await self.orchestrator.call_tool(
-                    session_id, 
-                    step.tool_name, 
-                    {"data": customer_data}
-                )
+            for wave in self._dependency_waves(template):
+                names = ", ".join(step.tool_name for step in wave)
+                progress.update(workflow_task, description=f"Executing {names}...")
                 
-                if result["success"]:
-                    self.console.print(f"[green]✓ {step.tool_name} completed successfully[/green]")
-                    # Update customer data with result if needed
-                    if "result" in result and isinstance(result["result"], dict):
-                        if "validated_data" in result["result"]:
-                            customer_data.update(result["result"]["validated_data"])
-                        elif "processed_data" in result["result"]:
-                            customer_data.update(result["result"]["processed_data"])
-                else:
-                    self.console.print(f"[red]✗ {step.tool_name} failed: {result['error']}[/red]")
+                # Execute independent tools concurrently; each sees the data as of the previous wave
+                results = await asyncio.gather(*[
+                    self.orchestrator.call_tool(session_id, step.tool_name, {"data": dict(customer_data)})
+                    for step in wave
+                ])
                 
-                progress.update(step_task, completed=1)
-                progress.update(workflow_task, advance=1)
+                for step, result in zip(wave, results):
+                    if result["success"]:
+                        self.console.print(f"[green]✓ {step.tool_name} completed successfully[/green]")
+                        # Update customer data with result if needed
+                        if "result" in result and isinstance(result["result"], dict):
+                            if "validated_data" in result["result"]:
+                                customer_data.update(result["result"]["validated_data"])
+                            elif "processed_data" in result["result"]:
+                                customer_data.update(result["result"]["processed_data"])
+                    else:
+                        self.console.print(f"[red]✗ {step.tool_name} failed: {result['error']}[/red]")
+                    
+                    progress.update(workflow_task, advance=1)
                 
                 # Small delay for demo effect
-                await asyncio.sleep(0.5)
+                await self._pause()
         
-        self.print_workflow_status(session_id, workflow_name)
+        self.print_workflow_status(session_id, workflow_name, template)
         
         # Show final audit report
         compliance_report = self.orchestrator.audit_monitor.generate_compliance_report(session_id)
@@ -152,7 +211,7 @@ class WorkflowDemo:
     async def demo_policy_violation(self):
         self.print_header("Demo 2: Policy Violation - Dependency Enforcement")
         
-        session_id = f"demo_violation_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        session_id = _session_id("violation")
         
         self.console.print("[bold]Attempting to process data without validation (should be blocked)[/bold]")
         
@@ -177,7 +236,7 @@ class WorkflowDemo:
             violations_table.add_column("Violation", style="red")
             
             for violation in violations:
-                timestamp = datetime.fromisoformat(violation["timestamp"]).strftime("%H:%M:%S")
+                timestamp = violation.get("display_time") or datetime.fromisoformat(violation["timestamp"]).strftime("%H:%M:%S")
                 violations_table.add_row(
                     timestamp,
                     violation.get("tool_name", ""),
@@ -214,7 +273,7 @@ class WorkflowDemo:
     async def demo_approval_workflow(self):
         self.print_header("Demo 3: Financial Processing with Approval Gate")
         
-        session_id = f"demo_approval_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        session_id = _session_id("approval")
         workflow_name = "financial_processing"
         
         financial_data = {
@@ -225,11 +284,22 @@ class WorkflowDemo:
         }
         
         self.console.print(f"[bold]Starting financial processing workflow[/bold]")
-        self.console.print(f"Transaction data: {json.dumps(financial_data, indent=2)}")
+        self.console.print(f"Transaction data: {_pretty(financial_data)}")
         
         # Get workflow template
         template = self.template_manager.get_template(workflow_name)
         
+        # Arguments per step, built once; the transaction data never changes during the run
+        step_args = {
+            "require_approval": {
+                "requested_action": "high_value_transfer",
+                "approval_level": "elevated",
+                "justification": f"Wire transfer of ${financial_data['amount']} to external bank",
+                "metadata": financial_data
+            }
+        }
+        default_args = {"data": financial_data}
+        
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -240,46 +310,41 @@ class WorkflowDemo:
             
             workflow_task = progress.add_task("Executing financial workflow...", total=len(template.steps))
             
-            for step in template.steps:
-                step_task = progress.add_task(f"Executing {step.tool_name}...", total=1)
+            for wave in self._dependency_waves(template):
+                names = ", ".join(step.tool_name for step in wave)
+                progress.update(workflow_task, description=f"Executing {names}...")
                 
-                # Prepare arguments based on step
-                if step.tool_name == "require_approval":
-                    args = {
-                        "requested_action": "high_value_transfer",
-                        "approval_level": "elevated",
-                        "justification": f"Wire transfer of ${financial_data['amount']} to external bank",
-                        "metadata": financial_data
-                    }
-                else:
-                    args = {"data": financial_data}
+                # Execute independent tools concurrently
+                results = await asyncio.gather(*[
+                    self.orchestrator.call_tool(
+                        session_id, step.tool_name, step_args.get(step.tool_name, default_args)
+                    )
+                    for step in wave
+                ])
                 
-                # Execute the tool
-                result = await self.orchestrator.call_tool(session_id, step.tool_name, args)
-                
-                if result["success"]:
-                    self.console.print(f"[green]✓ {step.tool_name} completed successfully[/green]")
+                for step, result in zip(wave, results):
+                    if result["success"]:
+                        self.console.print(f"[green]✓ {step.tool_name} completed successfully[/green]")
+                        
+                        # Show approval details if this was an approval step
+                        if step.tool_name == "require_approval" and "result" in result:
+                            approval_result = result["result"]
+                            self.console.print(f"   Approval ID: {approval_result.get('approval_id', 'N/A')}")
+                            self.console.print(f"   Approved: {approval_result.get('approved', False)}")
+                            self.console.print(f"   Approved by: {approval_result.get('approval_decision', {}).get('approved_by', 'N/A')}")
+                    else:
+                        self.console.print(f"[red]✗ {step.tool_name} failed: {result['error']}[/red]")
                     
-                    # Show approval details if this was an approval step
-                    if step.tool_name == "require_approval" and "result" in result:
-                        approval_result = result["result"]
-                        self.console.print(f"   Approval ID: {approval_result.get('approval_id', 'N/A')}")
-                        self.console.print(f"   Approved: {approval_result.get('approved', False)}")
-                        self.console.print(f"   Approved by: {approval_result.get('approval_decision', {}).get('approved_by', 'N/A')}")
-                else:
-                    self.console.print(f"[red]✗ {step.tool_name} failed: {result['error']}[/red]")
-                
-                progress.update(step_task, completed=1)
-                progress.update(workflow_task, advance=1)
+                    progress.update(workflow_task, advance=1)
                 
-                await asyncio.sleep(0.5)
+                await self._pause()
         
-        self.print_workflow_status(session_id, workflow_name)
+        self.print_workflow_status(session_id, workflow_name, template)
     
     async def demo_real_time_monitoring(self):
         self.print_header("Demo 4: Real-time Workflow Monitoring")
         
-        session_id = f"demo_monitoring_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        session_id = _session_id("monitoring")
         workflow_name = "data_pipeline"
         
         # Create layout for real-time monitoring
@@ -300,51 +365,62 @@ class WorkflowDemo:
         
         template = self.template_manager.get_template(workflow_name)
         
-        with Live(layout, console=self.console, screen=False, refresh_per_second=2) as live:
+        # Redraw only when a step changes what is on screen
+        with Live(layout, console=self.console, screen=False, auto_refresh=False) as live:
             # Update header
             layout["header"].update(Panel(
                 Text("Real-time Workflow Monitoring Dashboard", style="bold cyan"),
                 style="blue"
             ))
             
-            for i, step in enumerate(template.steps):
-                # Update main area with current step
-                progress_text = f"Step {i+1}/{len(template.steps)}: {step.tool_name}"
-                progress_bar = "█" * (i * 10 // len(template.steps)) + "░" * (10 - (i * 10 // len(template.steps)))
+            # Build the panels once and only swap their text on each step
+            status_text = Text()
+            metrics_text = Text()
+            layout["main"].update(Panel(status_text, title="Current Status"))
+            layout["footer"].update(Panel(metrics_text, title="Session Metrics"))
+            live.refresh()
+            
+            total_steps = len(template.steps)
+            i = 0
+            for wave in self._dependency_waves(template):
+                # Update main area with current step(s)
+                step_names = ", ".join(step.tool_name for step in wave)
+                progress_text = f"Step {i+1}/{total_steps}: {step_names}"
+                progress_bar = _PROGRESS_BARS[i * 10 // total_steps]
                 
-                layout["main"].update(Panel(
-                    f"{progress_text}\n\n{progress_bar} {(i / len(template.steps) * 100):.1f}%\n\nProcessing...",
-                    title="Current Status"
-                ))
+                status_text.plain = f"{progress_text}\n\n{progress_bar} {(i / total_steps * 100):.1f}%\n\nProcessing..."
+                live.refresh()
                 
-                # Execute step
-                result = await self.orchestrator.call_tool(
-                    session_id,
-                    step.tool_name,
-                    {"data": pipeline_data}
-                )
+                # Execute independent steps concurrently
+                await asyncio.gather(*[
+                    self.orchestrator.call_tool(session_id, step.tool_name, {"data": pipeline_data})
+                    for step in wave
+                ])
+                i += len(wave)
                 
                 # Update footer with session status
                 session_status = self.orchestrator.get_session_status(session_id)
                 footer_text = f"Session: {session_id}\n"
-                footer_text += f"Completed: {len(session_status['completed_tools'])}\n"
-                footer_text += f"Failed: {len(session_status['failed_tools'])}\n"
+                footer_text += f"Completed: {session_status['completed_count']}\n"
+                footer_text += f"Failed: {session_status['failed_count']}\n"
                 footer_text += f"Total Calls: {session_status['total_calls']}\n"
                 
-                layout["footer"].update(Panel(footer_text, title="Session Metrics"))
+                metrics_text.plain = footer_text
+                live.refresh()
                 
                 # Brief delay for demo effect
-                await asyncio.sleep(1)
+                await self._pause(2)
             
             # Final update
             layout["main"].update(Panel(
-                "Workflow Complete!\n\n██████████ 100%\n\nAll steps executed successfully",
+                f"Workflow Complete!\n\n{_PROGRESS_BARS[10]} 100%\n\nAll steps executed successfully",
                 title="Final Status",
                 style="green"
             ))
+            live.refresh()
             
             # Hold for a moment to show completion
-            await asyncio.sleep(2)
+            await self._pause(4)
     
     async def demo_comprehensive_audit(self):
         self.print_header("Demo 5: Comprehensive Audit Trail")
@@ -368,15 +444,18 @@ class WorkflowDemo:
             audit_table.add_row(
                 session["session_id"],
                 str(session["total_calls"]),
-                str(len(session["completed_tools"])),
-                str(len(session["failed_tools"])),
+                str(session["completed_count"]),
+                str(session["failed_count"]),
                 session["start_time"][:19] if session["start_time"] else "N/A"
             )
         
         self.console.print(audit_table)
         
+        # Violations and performance metrics come from a single audit snapshot
+        snapshot = self.orchestrator.audit_monitor.snapshot(violation_limit=10)
+        
         # Show policy violations across all sessions
-        all_violations = self.orchestrator.audit_monitor.get_policy_violations()
+        all_violations = snapshot["violations"]
         if all_violations:
             violations_table = Table(title="Policy Violations - All Sessions")
             violations_table.add_column("Session", style="cyan")
@@ -384,19 +463,19 @@ class WorkflowDemo:
             violations_table.add_column("Tool", style="red")
             violations_table.add_column("Violation", style="white")
             
-            for violation in all_violations[-10:]:  # Show last 10
-                timestamp = datetime.fromisoformat(violation["timestamp"]).strftime("%H:%M:%S")
+            for violation in all_violations:  # Last 10
+                timestamp = violation.get("display_time") or datetime.fromisoformat(violation["timestamp"]).strftime("%H:%M:%S")
                 violations_table.add_row(
                     violation["session_id"],
                     timestamp,
                     violation.get("tool_name", ""),
-                    violation["message"][:50] + "..." if len(violation["message"]) > 50 else violation["message"]
+                    violation["display_message"]
                 )
             
             self.console.print(violations_table)
         
         # Show performance metrics
-        performance_metrics = self.orchestrator.audit_monitor.get_tool_performance_metrics()
+        performance_metrics = snapshot["metrics"]
         if performance_metrics:
             perf_table = Table(title="Tool Performance Metrics")
             perf_table.add_column("Tool", style="cyan")
@@ -414,6 +493,21 @@ class WorkflowDemo:
             
             self.console.print(perf_table)
     
+    async def _run_captured(self, demo_func) -> str:
+        # Record into a private console so concurrent demos (and their live displays) don't interleave
+        console = Console(
+            file=io.StringIO(),
+            record=True,
+            width=self._console.width,
+            color_system=self._console.color_system
+        )
+        token = _demo_console.set(console)
+        try:
+            await demo_func()
+        finally:
+            _demo_console.reset(token)
+        return console.export_text(styles=True)
+    
     async def run_all_demos(self):
         self.console.print(Panel(
             Text("MCP Workflow Orchestrator - Complete Demo Suite", style="bold magenta"),
@@ -429,11 +523,23 @@ class WorkflowDemo:
             ("Comprehensive Audit", self.demo_comprehensive_audit)
         ]
         
-        for demo_name, demo_func in demos:
+        # Each demo uses its own session, so run them together and replay their output in order.
+        # The live monitoring dashboard has to draw on the real console, and the audit demo
+        # summarizes the others, so both run afterwards, one at a time.
+        *concurrent_demos, monitoring_demo, audit_demo = demos
+        outputs = await asyncio.gather(*[
+            self._run_captured(demo_func) for _, demo_func in concurrent_demos
+        ])
+        
+        for (demo_name, _), output in zip(concurrent_demos, outputs):
+            self.console.print(f"\n[bold blue]Running: {demo_name}[/bold blue]")
+            self.console.file.write(output)
+            self.console.print("\n" + "="*60 + "\n")
+        
+        for demo_name, demo_func in (monitoring_demo, audit_demo):
             self.console.print(f"\n[bold blue]Running: {demo_name}[/bold blue]")
             await demo_func()
             self.console.print("\n" + "="*60 + "\n")
-            await asyncio.sleep(1)
         
         self.console.print(Panel(
             Text("All demos completed successfully!", style="bold green"),
@@ -0,0 +1,44 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+import uvicorn
+
+import approval_server
+import backup_server
+import notification_server
+import processing_server
+import validation_server
+
+
+# Every downstream server in one process; each keeps its own routes under a path prefix,
+# so pointing a tool at e.g. http://localhost:8000/validation reaches /validation/call_tool
+MOUNTS = {
+    "/validation": validation_server.app,
+    "/processing": processing_server.app,
+    "/backup": backup_server.app,
+    "/notification": notification_server.app,
+    "/approval": approval_server.app
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Mounted apps do not get lifespan events, so run the notification server's here
+    async with notification_server.lifespan(notification_server.app):
+        yield
+
+
+app = FastAPI(title="Downstream MCP Servers", version="1.0.0", lifespan=lifespan)
+
+for prefix, sub_app in MOUNTS.items():
+    app.mount(prefix, sub_app)
+
+
+@app.get("/health")
+async def health_check():
+    return {"status": "healthy", "service": "downstream_servers", "mounts": list(MOUNTS)}
+
+
+if __name__ == "__main__":
+    # "auto" picks uvloop and httptools when they are installed and falls back to asyncio/h11 otherwise
+    config = uvicorn.Config(app, host="0.0.0.0", port=8000, loop="auto", http="auto", access_log=False)
+    uvicorn.Server(config).run()
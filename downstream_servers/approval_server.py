@@ -1,42 +1,72 @@
 import asyncio
+import itertools
 import json
 import logging
-from typing import Dict, Any, List
+import os
+from typing import Dict, Any
 from datetime import datetime, timedelta
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import uvicorn
 
+from ttl_cache import TTLCache
+
 
 class ToolCallRequest(BaseModel):
     tool_name: str
     arguments: Dict[str, Any]
 
 
-class ToolCallResponse(BaseModel):
-    success: bool
-    result: Any
-    error: str = None
-
-
 app = FastAPI(title="Approval MCP Server", version="1.0.0")
 logger = logging.getLogger(__name__)
 
+# Simulated latency is opt-in: SIMULATE_LATENCY=1 for the whole server, or "_simulate_latency" per request
+SIMULATE_LATENCY = os.getenv("SIMULATE_LATENCY", "0") == "1"
+
 # In-memory store for approval requests (in production, use a database)
-approval_requests = {}
+approval_requests = TTLCache(maxsize=10000, ttl=86400)
+
+# Per-process sequence for approval ids; the pid keeps ids unique across uvicorn workers
+_approval_seq = itertools.count(1)
+_APPROVAL_ID_PREFIX = f"approval_{os.getpid()}"
+
+# Approval workflow per level; read-only, shared by every response
+_APPROVAL_WORKFLOWS = {
+    "standard": {
+        "required_approvers": 1,
+        "approval_hierarchy": ["manager"],
+        "timeout_hours": 24,
+        "escalation_enabled": True,
+        "escalation_after_hours": 8
+    },
+    "elevated": {
+        "required_approvers": 2,
+        "approval_hierarchy": ["manager", "director"],
+        "timeout_hours": 48,
+        "escalation_enabled": True,
+        "escalation_after_hours": 4
+    },
+    "critical": {
+        "required_approvers": 3,
+        "approval_hierarchy": ["manager", "director", "ciso"],
+        "timeout_hours": 72,
+        "escalation_enabled": True,
+        "escalation_after_hours": 2
+    }
+}
 
 
-@app.post("/call_tool", response_model=ToolCallResponse)
+@app.post("/call_tool", response_model=None)
 async def call_tool(request: ToolCallRequest):
     if request.tool_name != "require_approval":
         raise HTTPException(status_code=400, detail=f"Unknown tool: {request.tool_name}")
     
     try:
         result = await require_approval(request.arguments)
-        return ToolCallResponse(success=True, result=result)
+        return {"success": True, "result": result, "error": None}
     except Exception as e:
         logger.error(f"Error in require_approval: {str(e)}")
-        return ToolCallResponse(success=False, error=str(e))
+        return {"success": False, "result": None, "error": str(e)}
 
 
 async def require_approval(arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -47,15 +77,17 @@ async def require_approval(arguments: Dict[str, Any]) -> Dict[str, Any]:
     justification = arguments.get("justification", "")
     
     # Simulate approval delay
-    await asyncio.sleep(0.3)
+    if arguments.get("_simulate_latency", SIMULATE_LATENCY):
+        await asyncio.sleep(0.3)
     
     approval_timestamp = datetime.now()
-    approval_id = f"approval_{approval_timestamp.strftime('%Y%m%d_%H%M%S')}_{id(requested_action) % 10000}"
+    approval_time = approval_timestamp.isoformat()
+    approval_id = f"{_APPROVAL_ID_PREFIX}_{approval_timestamp.strftime('%Y%m%d_%H%M%S')}_{next(_approval_seq):06d}"
     
     # Create approval request
     approval_request = {
         "approval_id": approval_id,
-        "created_at": approval_timestamp.isoformat(),
+        "created_at": approval_time,
         "requested_action": requested_action,
         "approval_type": approval_type,
         "approval_level": approval_level,
@@ -66,32 +98,7 @@ async def require_approval(arguments: Dict[str, Any]) -> Dict[str, Any]:
     }
     
     # Determine approval workflow based on level
-    approval_workflow = {}
-    
-    if approval_level == "standard":
-        approval_workflow = {
-            "required_approvers": 1,
-            "approval_hierarchy": ["manager"],
-            "timeout_hours": 24,
-            "escalation_enabled": True,
-            "escalation_after_hours": 8
-        }
-    elif approval_level == "elevated":
-        approval_workflow = {
-            "required_approvers": 2,
-            "approval_hierarchy": ["manager", "director"],
-            "timeout_hours": 48,
-            "escalation_enabled": True,
-            "escalation_after_hours": 4
-        }
-    elif approval_level == "critical":
-        approval_workflow = {
-            "required_approvers": 3,
-            "approval_hierarchy": ["manager", "director", "ciso"],
-            "timeout_hours": 72,
-            "escalation_enabled": True,
-            "escalation_after_hours": 2
-        }
+    approval_workflow = _APPROVAL_WORKFLOWS.get(approval_level, {})
     
     # Auto-approve certain types for demo purposes
     auto_approve_types = arguments.get("auto_approve_types", ["standard_processing"])
@@ -100,22 +107,21 @@ async def require_approval(arguments: Dict[str, Any]) -> Dict[str, Any]:
         approval_decision = {
             "approved": True,
             "approved_by": "system",
-            "approved_at": approval_timestamp.isoformat(),
+            "approved_at": approval_time,
             "approval_method": "automatic",
             "approval_reason": "Matches auto-approval criteria"
         }
-        approval_request["status"] = "approved"
     else:
         # For demo purposes, simulate manual approval
         # In production, this would integrate with an approval system
         approval_decision = {
             "approved": True,  # Auto-approve for demo
             "approved_by": "demo_approver",
-            "approved_at": approval_timestamp.isoformat(),
+            "approved_at": approval_time,
             "approval_method": "manual",
             "approval_reason": "Demo auto-approval"
         }
-        approval_request["status"] = "approved"
+    approval_request["status"] = "approved"
     
     # Store approval request
     approval_requests[approval_id] = approval_request
@@ -123,13 +129,13 @@ async def require_approval(arguments: Dict[str, Any]) -> Dict[str, Any]:
     # Add audit trail
     audit_trail = [
         {
-            "timestamp": approval_timestamp.isoformat(),
+            "timestamp": approval_time,
             "action": "approval_requested",
             "actor": "system",
             "details": f"Approval requested for {requested_action}"
         },
         {
-            "timestamp": approval_timestamp.isoformat(),
+            "timestamp": approval_time,
             "action": "approval_granted",
             "actor": approval_decision["approved_by"],
             "details": approval_decision["approval_reason"]
@@ -153,7 +159,7 @@ async def require_approval(arguments: Dict[str, Any]) -> Dict[str, Any]:
     # Add notification info
     notification_info = {
         "approvers_notified": ["manager@company.com"],
-        "notification_sent_at": approval_timestamp.isoformat(),
+        "notification_sent_at": approval_time,
         "reminder_schedule": ["4h", "8h", "24h"],
         "escalation_contacts": ["director@company.com"]
     }
@@ -182,13 +188,15 @@ async def get_approval_status(approval_id: str):
 
 @app.get("/approvals")
 async def list_approvals():
-    return list(approval_requests.values())
+    return approval_requests.values()
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "approval_server"}
+    return {"status": "healthy", "service": "approval_server", "approval_store": approval_requests.stats()}
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8005)
\ No newline at end of file
+    # "auto" picks uvloop and httptools when they are installed and falls back to asyncio/h11 otherwise
+    config = uvicorn.Config(app, host="0.0.0.0", port=8005, loop="auto", http="auto", access_log=False)
+    uvicorn.Server(config).run()
@@ -1,8 +1,10 @@
 import asyncio
+import hashlib
 import json
 import logging
+import os
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import uvicorn
@@ -13,27 +15,38 @@ class ToolCallRequest(BaseModel):
     arguments: Dict[str, Any]
 
 
-class ToolCallResponse(BaseModel):
-    success: bool
-    result: Any
-    error: str = None
-
-
 app = FastAPI(title="Backup MCP Server", version="1.0.0")
 logger = logging.getLogger(__name__)
 
+# Simulated latency is opt-in: SIMULATE_LATENCY=1 for the whole server, or "_simulate_latency" per request
+SIMULATE_LATENCY = os.getenv("SIMULATE_LATENCY", "0") == "1"
+
+# Static parts of every backup result; each request merges in its own timestamp or size
+_BACKUP_VERIFICATION = {
+    "verification_status": "passed",
+    "integrity_check": "passed",
+    "accessibility_check": "passed"
+}
+
+_STORAGE_METRICS = {
+    "compression_ratio": 0.7,  # Simulated compression
+    "deduplication_savings": 0.15,  # Simulated deduplication
+    "total_backups": 47,  # Simulated count
+    "oldest_backup": "2024-01-01T00:00:00Z"
+}
 
-@app.post("/call_tool", response_model=ToolCallResponse)
+
+@app.post("/call_tool", response_model=None)
 async def call_tool(request: ToolCallRequest):
     if request.tool_name != "backup_data":
         raise HTTPException(status_code=400, detail=f"Unknown tool: {request.tool_name}")
     
     try:
         result = await backup_data(request.arguments)
-        return ToolCallResponse(success=True, result=result)
+        return {"success": True, "result": result, "error": None}
     except Exception as e:
         logger.error(f"Error in backup_data: {str(e)}")
-        return ToolCallResponse(success=False, error=str(e))
+        return {"success": False, "result": None, "error": str(e)}
 
 
 async def backup_data(arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -42,22 +55,26 @@ async def backup_data(arguments: Dict[str, Any]) -> Dict[str, Any]:
     backup_type = arguments.get("backup_type", "full")
     retention_days = arguments.get("retention_days", 30)
     
-    # Simulate backup time based on data size
-    data_size = len(json.dumps(data))
+    # Simulate backup time based on data size; the sorted serialization has the same length
+    # as the plain one, so a single dump serves both the size and the checksum
+    serialized = json.dumps(data, sort_keys=True).encode()
+    data_size = len(serialized)
     backup_delay = min(1.0, data_size / 500)  # Max 1 second
-    await asyncio.sleep(backup_delay)
+    if arguments.get("_simulate_latency", SIMULATE_LATENCY):
+        await asyncio.sleep(backup_delay)
     
     backup_timestamp = datetime.now()
+    backup_timestamp_iso = backup_timestamp.isoformat()
     backup_id = f"backup_{backup_timestamp.strftime('%Y%m%d_%H%M%S')}_{id(data) % 10000}"
     
     # Create backup metadata
     backup_metadata = {
         "backup_id": backup_id,
         "backup_type": backup_type,
-        "created_at": backup_timestamp.isoformat(),
-        "expires_at": (backup_timestamp.replace(day=backup_timestamp.day + retention_days)).isoformat(),
+        "created_at": backup_timestamp_iso,
+        "expires_at": (backup_timestamp + timedelta(days=retention_days)).isoformat(),
         "data_size_bytes": data_size,
-        "checksum": f"sha256:{hash(json.dumps(data, sort_keys=True)) % 1000000}",
+        "checksum": f"sha256:{hashlib.sha256(serialized).hexdigest()}",
         "retention_days": retention_days,
         "backup_location": f"s3://backups/{backup_id[:8]}/{backup_id}",
         "compression": "gzip",
@@ -78,12 +95,7 @@ async def backup_data(arguments: Dict[str, Any]) -> Dict[str, Any]:
         backup_metadata["base_backup_id"] = arguments.get("base_backup_id")
     
     # Add backup verification
-    backup_verification = {
-        "verification_status": "passed",
-        "verification_timestamp": backup_timestamp.isoformat(),
-        "integrity_check": "passed",
-        "accessibility_check": "passed"
-    }
+    backup_verification = {**_BACKUP_VERIFICATION, "verification_timestamp": backup_timestamp_iso}
     
     # Simulate backup policies
     backup_policies = {
@@ -98,13 +110,7 @@ async def backup_data(arguments: Dict[str, Any]) -> Dict[str, Any]:
         raise Exception("Simulated backup failure - storage unavailable")
     
     # Add storage metrics
-    storage_metrics = {
-        "storage_used_bytes": data_size,
-        "compression_ratio": 0.7,  # Simulated compression
-        "deduplication_savings": 0.15,  # Simulated deduplication
-        "total_backups": 47,  # Simulated count
-        "oldest_backup": "2024-01-01T00:00:00Z"
-    }
+    storage_metrics = {"storage_used_bytes": data_size, **_STORAGE_METRICS}
     
     return {
         "success": True,
@@ -123,4 +129,6 @@ async def health_check():
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8003)
\ No newline at end of file
+    # "auto" picks uvloop and httptools when they are installed and falls back to asyncio/h11 otherwise
+    config = uvicorn.Config(app, host="0.0.0.0", port=8003, loop="auto", http="auto", access_log=False)
+    uvicorn.Server(config).run()
@@ -1,10 +1,16 @@
 import asyncio
 import json
 import logging
-from typing import Dict, Any, List
+import os
+import time
+from collections import Counter
+from typing import Dict, Any, List, Optional, Set, Tuple
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
 from datetime import datetime
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
+import httpx
 import uvicorn
 
 
@@ -13,102 +19,172 @@ class ToolCallRequest(BaseModel):
     arguments: Dict[str, Any]
 
 
-class ToolCallResponse(BaseModel):
-    success: bool
-    result: Any
-    error: str = None
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client for every webhook delivery instead of a connection per call
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=5.0
+    )
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
 
 
-app = FastAPI(title="Notification MCP Server", version="1.0.0")
+app = FastAPI(title="Notification MCP Server", version="1.0.0", lifespan=lifespan)
 logger = logging.getLogger(__name__)
 
+# Simulated latency is opt-in: SIMULATE_LATENCY=1 for the whole server, or "_simulate_latency" per request
+SIMULATE_LATENCY = os.getenv("SIMULATE_LATENCY", "0") == "1"
+
+# Hosts webhooks may really be POSTed to, e.g. WEBHOOK_ALLOWED_HOSTS=hooks.example.com,localhost.
+# Unset means no live delivery: webhook notifications are simulated as before
+WEBHOOK_ALLOWED_HOSTS = frozenset(
+    host.strip().lower() for host in os.getenv("WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()
+)
+
+# Per-recipient delivery fields for each channel that fans out to recipients
+_TYPE_EXTRA = {
+    "email": {
+        "delivery_method": "smtp",
+        "bounce_rate": 0.02,
+        "open_rate": 0.25  # Simulated metrics
+    },
+    "sms": {
+        "delivery_method": "sms_gateway",
+        "cost_usd": 0.01,  # Simulated cost
+        "delivery_time_ms": 1500
+    },
+    "push": {
+        "delivery_method": "push_service",
+        "device_type": "mobile",
+        "click_rate": 0.15  # Simulated metrics
+    }
+}
+
+# Compliance and audit info is the same for every notification; it is only ever read
+_COMPLIANCE_INFO = {
+    "gdpr_compliant": True,
+    "opt_out_available": True,
+    "data_retention_days": 90,
+    "audit_log_enabled": True,
+    "encryption_in_transit": True,
+    "encryption_at_rest": True
+}
 
-@app.post("/call_tool", response_model=ToolCallResponse)
+
+@app.post("/call_tool", response_model=None)
 async def call_tool(request: ToolCallRequest):
     if request.tool_name != "send_notification":
         raise HTTPException(status_code=400, detail=f"Unknown tool: {request.tool_name}")
     
     try:
-        result = await send_notification(request.arguments)
-        return ToolCallResponse(success=True, result=result)
+        # Only simulated deliveries share the batcher's delay; failures and real webhook posts go direct
+        arguments = request.arguments
+        if (arguments.get("_simulate_latency", SIMULATE_LATENCY)
+                and not arguments.get("simulate_failure", False)
+                and not _is_live_webhook(arguments)):
+            result = await notification_batcher.submit(arguments)
+        else:
+            result = await send_notification(arguments)
+        if not result["success"]:
+            return {"success": False, "result": result, "error": result["message"]}
+        return {"success": True, "result": result, "error": None}
     except Exception as e:
         logger.error(f"Error in send_notification: {str(e)}")
-        return ToolCallResponse(success=False, error=str(e))
+        return {"success": False, "result": None, "error": str(e)}
+
+
+def _is_live_webhook(arguments: Dict[str, Any]) -> bool:
+    return bool(WEBHOOK_ALLOWED_HOSTS) and arguments.get("type") == "webhook" and bool(arguments.get("webhook_url"))
+
+
+def _check_webhook_url(webhook_url: str):
+    # Caller-supplied URLs are only POSTed to over http(s) and to an allowed host
+    parts = urlsplit(webhook_url)
+    if parts.scheme not in ("http", "https") or (parts.hostname or "").lower() not in WEBHOOK_ALLOWED_HOSTS:
+        raise ValueError(f"Webhook URL not allowed: {webhook_url}")
 
 
 async def send_notification(arguments: Dict[str, Any]) -> Dict[str, Any]:
-    # Simulate notification sending
+    if _is_live_webhook(arguments):
+        _check_webhook_url(arguments["webhook_url"])
+        webhook_delivery = await deliver_webhook(arguments["webhook_url"], arguments)
+        return build_notification(arguments, webhook_delivery)
+    
+    # Simulate sending delay
+    if arguments.get("_simulate_latency", SIMULATE_LATENCY):
+        await asyncio.sleep(0.2)
+    return build_notification(arguments)
+
+
+async def deliver_webhook(webhook_url: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    payload = {
+        "subject": arguments.get("subject", "Notification"),
+        "message": arguments.get("message", ""),
+        "priority": arguments.get("priority", "normal")
+    }
+    start = time.perf_counter()
+    try:
+        response = await app.state.http.post(webhook_url, json=payload)
+        delivery_status = "delivered" if response.is_success else "failed"
+        response_code = response.status_code
+    except httpx.HTTPError as e:
+        logger.warning(f"Webhook delivery to {webhook_url} failed: {e}")
+        delivery_status = "failed"
+        response_code = None
+    
+    return {
+        "delivery_status": delivery_status,
+        "response_code": response_code,
+        "response_time_ms": int((time.perf_counter() - start) * 1000)
+    }
+
+
+def build_notification(arguments: Dict[str, Any], webhook_delivery: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     notification_type = arguments.get("type", "email")
     recipients = arguments.get("recipients", [])
     message = arguments.get("message", "")
     subject = arguments.get("subject", "Notification")
     priority = arguments.get("priority", "normal")
     
-    # Simulate sending delay
-    await asyncio.sleep(0.2)
-    
     notification_timestamp = datetime.now()
     notification_id = f"notif_{notification_timestamp.strftime('%Y%m%d_%H%M%S')}_{id(message) % 10000}"
+    delivery_timestamp_iso = notification_timestamp.isoformat()
     
     # Process different notification types
     delivery_results = []
     
-    if notification_type == "email":
-        for recipient in recipients:
-            delivery_result = {
-                "recipient": recipient,
-                "delivery_status": "delivered",
-                "delivery_timestamp": notification_timestamp.isoformat(),
-                "message_id": f"email_{notification_id}_{recipients.index(recipient)}",
-                "delivery_method": "smtp",
-                "bounce_rate": 0.02,
-                "open_rate": 0.25  # Simulated metrics
-            }
-            delivery_results.append(delivery_result)
-    
-    elif notification_type == "sms":
-        for recipient in recipients:
-            delivery_result = {
+    extra = _TYPE_EXTRA.get(notification_type)
+    if extra is not None:
+        for idx, recipient in enumerate(recipients):
+            delivery_results.append({
                 "recipient": recipient,
                 "delivery_status": "delivered",
-                "delivery_timestamp": notification_timestamp.isoformat(),
-                "message_id": f"sms_{notification_id}_{recipients.index(recipient)}",
-                "delivery_method": "sms_gateway",
-                "cost_usd": 0.01,  # Simulated cost
-                "delivery_time_ms": 1500
-            }
-            delivery_results.append(delivery_result)
-    
-    elif notification_type == "push":
-        for recipient in recipients:
-            delivery_result = {
-                "recipient": recipient,
-                "delivery_status": "delivered",
-                "delivery_timestamp": notification_timestamp.isoformat(),
-                "message_id": f"push_{notification_id}_{recipients.index(recipient)}",
-                "delivery_method": "push_service",
-                "device_type": "mobile",
-                "click_rate": 0.15  # Simulated metrics
-            }
-            delivery_results.append(delivery_result)
-    
+                "delivery_timestamp": delivery_timestamp_iso,
+                "message_id": f"{notification_type}_{notification_id}_{idx}",
+                **extra
+            })
     elif notification_type == "webhook":
         webhook_url = arguments.get("webhook_url")
         delivery_result = {
             "webhook_url": webhook_url,
             "delivery_status": "delivered",
-            "delivery_timestamp": notification_timestamp.isoformat(),
+            "delivery_timestamp": delivery_timestamp_iso,
             "message_id": f"webhook_{notification_id}",
             "delivery_method": "http_post",
             "response_code": 200,
             "response_time_ms": 150
         }
+        if webhook_delivery is not None:
+            delivery_result.update(webhook_delivery)
         delivery_results.append(delivery_result)
     
     # Add notification metadata
     notification_metadata = {
         "notification_id": notification_id,
-        "created_at": notification_timestamp.isoformat(),
+        "created_at": delivery_timestamp_iso,
         "notification_type": notification_type,
         "priority": priority,
         "message_length": len(message),
@@ -118,25 +194,16 @@ async def send_notification(arguments: Dict[str, Any]) -> Dict[str, Any]:
     }
     
     # Add delivery statistics
+    status_counts = Counter(r["delivery_status"] for r in delivery_results)
     delivery_stats = {
         "total_sent": len(delivery_results),
-        "successful_deliveries": len([r for r in delivery_results if r["delivery_status"] == "delivered"]),
-        "failed_deliveries": len([r for r in delivery_results if r["delivery_status"] == "failed"]),
-        "pending_deliveries": len([r for r in delivery_results if r["delivery_status"] == "pending"]),
-        "delivery_rate": 1.0 if delivery_results else 0.0,
+        "successful_deliveries": status_counts["delivered"],
+        "failed_deliveries": status_counts["failed"],
+        "pending_deliveries": status_counts["pending"],
+        "delivery_rate": status_counts["delivered"] / len(delivery_results) if delivery_results else 0.0,
         "average_delivery_time_ms": 1200  # Simulated
     }
     
-    # Add compliance and audit info
-    compliance_info = {
-        "gdpr_compliant": True,
-        "opt_out_available": True,
-        "data_retention_days": 90,
-        "audit_log_enabled": True,
-        "encryption_in_transit": True,
-        "encryption_at_rest": True
-    }
-    
     # Check for notification errors (simulate occasional failures)
     if arguments.get("simulate_failure", False):
         raise Exception("Simulated notification failure - service unavailable")
@@ -151,22 +218,76 @@ async def send_notification(arguments: Dict[str, Any]) -> Dict[str, Any]:
             "segmentation_tags": arguments.get("tags", [])
         }
     
+    failed = status_counts["failed"]
+    if failed:
+        summary = f"Notification delivery failed for {failed} of {len(delivery_results)} target(s) via {notification_type}"
+    else:
+        summary = f"Notification sent successfully to {len(recipients)} recipient(s) via {notification_type}"
+    
     return {
-        "success": True,
+        "success": not failed,
         "notification_id": notification_id,
         "notification_metadata": notification_metadata,
         "delivery_results": delivery_results,
         "delivery_stats": delivery_stats,
-        "compliance_info": compliance_info,
+        "compliance_info": _COMPLIANCE_INFO,
         "campaign_info": campaign_info,
-        "message": f"Notification sent successfully to {len(recipients)} recipient(s) via {notification_type}"
+        "message": summary
     }
 
 
+# Groups concurrent sends so one simulated delivery round serves the whole batch
+class NotificationBatcher:
+    def __init__(self, max_batch_size: int = 32, max_wait: float = 0.02):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((arguments, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._dispatch)
+        return await future
+    
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _send_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        self.batches += 1
+        # Simulate sending delay once for every request in the batch
+        await asyncio.sleep(0.2)
+        for arguments, future in batch:
+            if future.done():
+                continue
+            try:
+                future.set_result(build_notification(arguments))
+            except Exception as e:
+                future.set_exception(e)
+
+
+notification_batcher = NotificationBatcher()
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "notification_server"}
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8004)
\ No newline at end of file
+    # "auto" picks uvloop and httptools when they are installed and falls back to asyncio/h11 otherwise
+    config = uvicorn.Config(app, host="0.0.0.0", port=8004, loop="auto", http="auto", access_log=False)
+    uvicorn.Server(config).run()
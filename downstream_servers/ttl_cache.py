@@ -0,0 +1,68 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List
+
+
+def body_key(body: bytes) -> bytes:
+    # Short digest of a raw request body, for use as a cache key
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+# Bounded map whose entries expire a fixed ttl after they were last written
+class TTLCache:
+    def __init__(self, maxsize: int = 10000, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.inserts = 0
+        self.evictions = 0
+        # Insertion order is expiry order because every entry gets the same ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def _expire(self):
+        now = time.monotonic()
+        while self._entries:
+            expires, _ = next(iter(self._entries.values()))
+            if expires > now:
+                break
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        self._expire()
+        entry = self._entries.get(key)
+        return entry[1] if entry else default
+    
+    def __setitem__(self, key: Hashable, value: Any):
+        self._expire()
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self.inserts += 1
+        # Oldest entries go first once the cache is full
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def __contains__(self, key: Hashable) -> bool:
+        self._expire()
+        return key in self._entries
+    
+    def __getitem__(self, key: Hashable) -> Any:
+        self._expire()
+        return self._entries[key][1]
+    
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._entries)
+    
+    def values(self) -> List[Any]:
+        self._expire()
+        return [value for _, value in self._entries.values()]
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "inserts": self.inserts,
+            "evictions": self.evictions
+        }
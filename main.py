@@ -7,10 +7,6 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
-from demo_workflows import WorkflowDemo
-from orchestrator import MCPOrchestrator
-from workflow_templates import WorkflowTemplateManager
-
 
 def setup_logging():
     """Configure logging for the application."""
@@ -24,6 +20,19 @@ def setup_logging():
     )
 
 
+def run_async(coro):
+    """Run a coroutine on uvloop when it is installed, otherwise on the stock asyncio loop."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    if hasattr(uvloop, "run"):
+        return uvloop.run(coro)
+    # uvloop releases before 0.18 only offer the event loop policy
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro)
+
+
 def print_banner():
     """Print the application banner."""
     console = Console()
@@ -99,27 +108,35 @@ def print_help():
 
 async def run_demo(demo_type: str = "all"):
     """Run demonstration workflows."""
+    from demo_workflows import WorkflowDemo
+    
     demo = WorkflowDemo()
     
-    if demo_type == "all":
-        await demo.run_all_demos()
-    elif demo_type == "success":
-        await demo.demo_successful_workflow()
-    elif demo_type == "violation":
-        await demo.demo_policy_violation()
-    elif demo_type == "approval":
-        await demo.demo_approval_workflow()
-    elif demo_type == "monitoring":
-        await demo.demo_real_time_monitoring()
-    elif demo_type == "audit":
-        await demo.demo_comprehensive_audit()
-    else:
-        print(f"Unknown demo type: {demo_type}")
-        return
+    try:
+        if demo_type == "all":
+            await demo.run_all_demos()
+        elif demo_type == "success":
+            await demo.demo_successful_workflow()
+        elif demo_type == "violation":
+            await demo.demo_policy_violation()
+        elif demo_type == "approval":
+            await demo.demo_approval_workflow()
+        elif demo_type == "monitoring":
+            await demo.demo_real_time_monitoring()
+        elif demo_type == "audit":
+            await demo.demo_comprehensive_audit()
+        else:
+            print(f"Unknown demo type: {demo_type}")
+            return
+    finally:
+        await demo.orchestrator.aclose()
 
 
 async def show_status():
     """Show system status."""
+    from orchestrator import MCPOrchestrator
+    from workflow_templates import WorkflowTemplateManager
+    
     console = Console()
     orchestrator = MCPOrchestrator()
     template_manager = WorkflowTemplateManager()
@@ -153,6 +170,10 @@ async def show_status():
 
 async def interactive_mode():
     """Start interactive mode."""
+    from demo_workflows import WorkflowDemo
+    from orchestrator import MCPOrchestrator
+    from workflow_templates import WorkflowTemplateManager
+    
     console = Console()
     orchestrator = MCPOrchestrator()
     template_manager = WorkflowTemplateManager()
@@ -196,7 +217,10 @@ async def interactive_mode():
                     console.print("No active sessions")
             elif command == "audit":
                 demo = WorkflowDemo()
-                await demo.demo_comprehensive_audit()
+                try:
+                    await demo.demo_comprehensive_audit()
+                finally:
+                    await demo.orchestrator.aclose()
             elif command.startswith("demo "):
                 demo_type = command.split(" ", 1)[1]
                 await run_demo(demo_type)
@@ -247,22 +271,24 @@ def main():
     if args.command == "help":
         print_help()
     elif args.command == "demo":
-        asyncio.run(run_demo(args.demo_type))
+        run_async(run_demo(args.demo_type))
     elif args.command == "demo-success":
-        asyncio.run(run_demo("success"))
+        run_async(run_demo("success"))
     elif args.command == "demo-violation":
-        asyncio.run(run_demo("violation"))
+        run_async(run_demo("violation"))
     elif args.command == "demo-approval":
-        asyncio.run(run_demo("approval"))
+        run_async(run_demo("approval"))
     elif args.command == "demo-monitoring":
-        asyncio.run(run_demo("monitoring"))
+        run_async(run_demo("monitoring"))
     elif args.command == "demo-audit":
-        asyncio.run(run_demo("audit"))
+        run_async(run_demo("audit"))
     elif args.command == "interactive":
-        asyncio.run(interactive_mode())
+        run_async(interactive_mode())
     elif args.command == "status":
-        asyncio.run(show_status())
+        run_async(show_status())
     elif args.command == "templates":
+        from workflow_templates import WorkflowTemplateManager
+        
         template_manager = WorkflowTemplateManager()
         templates = template_manager.list_templates()
         console = Console()
@@ -5,7 +5,7 @@ import json
 import logging
 import os
 import sys
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -13,218 +13,280 @@ from orchestrator import MCPOrchestrator
 from workflow_templates import WorkflowTemplateManager
 
 
-@dataclass
+@dataclass(init=False)
 class MCPRequest:
+    # One is built per incoming frame; slots keep it to four fields with no instance dict
+    __slots__ = ("jsonrpc", "id", "method", "params")
+    
     jsonrpc: str
     id: Optional[str]
     method: str
-    params: Optional[Dict[str, Any]] = None
+    params: Optional[Dict[str, Any]]
+    
+    def __init__(self, jsonrpc: str, id: Optional[str], method: str,
+                 params: Optional[Dict[str, Any]] = None):
+        # A slot cannot carry a class-level default, so params defaults here
+        self.jsonrpc = jsonrpc
+        self.id = id
+        self.method = method
+        self.params = params
+    
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "MCPRequest":
+        # Raises KeyError when a required field is missing
+        return cls(message["jsonrpc"], message.get("id"), _intern(message["method"]), message.get("params"))
 
 
-@dataclass
-class MCPResponse:
-    jsonrpc: str
-    id: Optional[str]
-    result: Optional[Any] = None
-    error: Optional[Dict[str, Any]] = None
+# JSON-RPC error codes
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# Handlers return the JSON-RPC response as a plain dict, or as an already-encoded frame
+MCPResult = Union[Dict[str, Any], bytes]
+
+
+def _ok(request_id: Optional[str], result: Any) -> Dict[str, Any]:
+    """Build a JSON-RPC success response as a plain dict, ready for encoding."""
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def _error_response(request_id: Optional[str], code: int, message: str) -> Dict[str, Any]:
+    """Build a JSON-RPC error response as a plain dict, ready for encoding."""
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+# json.dumps builds a fresh encoder whenever it gets non-default options, so each preset is built once here
+_encode = json.JSONEncoder().encode
+_encode_compact = json.JSONEncoder(separators=(",", ":")).encode
+_encode_pretty = json.JSONEncoder(indent=2).encode
+# json.loads with no options already reuses a shared decoder, and unlike JSONDecoder.decode it accepts bytes
+_decode = json.loads
+
+# Tool results share one JSON skeleton; only the id and the text are encoded per response
+_TEXT_RESULT_HEAD = '{"jsonrpc":"2.0","id":'
+_TEXT_RESULT_BODY = ',"result":{"content":[{"type":"text","text":'
+_TEXT_RESULT_TAIL = '}]}}\n'
+
+
+def _text_result(request_id: Optional[str], text: str) -> bytes:
+    """Build a framed JSON-RPC response whose result is a single text content item."""
+    return (_TEXT_RESULT_HEAD + _encode(request_id) + _TEXT_RESULT_BODY + _encode(text) + _TEXT_RESULT_TAIL).encode("utf-8")
+
+
+def _intern(name: Any) -> Any:
+    """Intern method and tool names so dispatch lookups hit on identity; other values pass through."""
+    return sys.intern(name) if type(name) is str else name
+
+
+def _step_summary(tool_name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "tool": tool_name,
+        "success": result["success"],
+        "result": result.get("result"),
+        "error": result.get("error")
+    }
+
+
+# Longest JSON-RPC line accepted from stdin; workflow payloads can be far larger than a read chunk.
+# A longer line is dropped up to its newline and the server keeps reading
+STDIN_LINE_LIMIT = 16 * 1024 * 1024
+STDIN_READ_CHUNK = 64 * 1024
+# Pipelined requests handled before their responses are flushed together
+MAX_PIPELINED_BATCH = 32
+# Methods that can take as long as a downstream call; earlier responses are flushed before these run
+SLOW_METHODS = frozenset({"tools/call"})
+
+# tools/list and resources/list never change, so their results are built once at import
+_TOOLS_LIST_RESULT = {"tools": [
+    {
+        "name": "execute_workflow",
+        "description": "Execute a workflow with the specified template and data",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "template_name": {
+                    "type": "string",
+                    "description": "Name of the workflow template to execute"
+                },
+                "session_id": {
+                    "type": "string",
+                    "description": "Unique session identifier for the workflow"
+                },
+                "data": {
+                    "type": "object",
+                    "description": "Data to process through the workflow"
+                }
+            },
+            "required": ["template_name", "session_id", "data"]
+        }
+    },
+    {
+        "name": "call_tool",
+        "description": "Call a specific tool with policy enforcement",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "session_id": {
+                    "type": "string",
+                    "description": "Session identifier"
+                },
+                "tool_name": {
+                    "type": "string",
+                    "description": "Name of the tool to call"
+                },
+                "arguments": {
+                    "type": "object",
+                    "description": "Arguments to pass to the tool"
+                }
+            },
+            "required": ["session_id", "tool_name", "arguments"]
+        }
+    },
+    {
+        "name": "get_workflow_status",
+        "description": "Get the status of a workflow session",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "session_id": {
+                    "type": "string",
+                    "description": "Session identifier"
+                }
+            },
+            "required": ["session_id"]
+        }
+    },
+    {
+        "name": "list_templates",
+        "description": "List available workflow templates",
+        "inputSchema": {
+            "type": "object",
+            "properties": {}
+        }
+    },
+    {
+        "name": "get_audit_report",
+        "description": "Get comprehensive audit report for a session",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "session_id": {
+                    "type": "string",
+                    "description": "Session identifier (optional)"
+                }
+            }
+        }
+    }
+]}
+
+_RESOURCES_LIST_RESULT = {"resources": [
+    {
+        "uri": "workflow://templates",
+        "name": "Workflow Templates",
+        "description": "Available workflow templates",
+        "mimeType": "application/json"
+    },
+    {
+        "uri": "workflow://config",
+        "name": "Configuration",
+        "description": "Current system configuration",
+        "mimeType": "application/json"
+    }
+]}
 
 
 class MCPWorkflowServer:
+    NOTIFICATION_PREFIX = "notifications/"
+    
     def __init__(self):
         self.orchestrator = MCPOrchestrator()
         self.template_manager = WorkflowTemplateManager()
         self.logger = logging.getLogger(__name__)
         
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        # Bytes read from stdin that do not yet end in a newline
+        self._stdin_pending = bytearray()
+        # Set while skipping the rest of an over-long line
+        self._stdin_discarding = False
+        
+        # (template set version, listing text, JSON text); see _templates_views
+        self._templates_cache: Optional[Tuple[int, str, str]] = None
+        
+        # Built once so dispatch is a single dict lookup per request
+        # Keys are interned to match the interned names taken from requests
+        self._method_handlers = {
+            "initialize": self.handle_initialize,
+            "tools/list": self.handle_tools_list,
+            "tools/call": self.handle_tools_call,
+            "resources/list": self.handle_resources_list,
+            "resources/read": self.handle_resources_read,
+            "prompts/list": self.handle_prompts_list
+        }
+        self._method_handlers = {_intern(name): handler for name, handler in self._method_handlers.items()}
+        self._tool_handlers = {
+            "execute_workflow": self.execute_workflow,
+            "call_tool": self.call_tool,
+            "get_workflow_status": self.get_workflow_status,
+            "list_templates": self.list_templates,
+            "get_audit_report": self.get_audit_report
+        }
+        self._tool_handlers = {_intern(name): handler for name, handler in self._tool_handlers.items()}
     
-    async def handle_request(self, request: MCPRequest) -> Optional[MCPResponse]:
+    async def handle_request(self, request: MCPRequest) -> Optional[MCPResult]:
         """Handle incoming MCP requests."""
-        self.logger.info(f"Received request: method={request.method}, id={request.id}, params={request.params}")
+        self.logger.debug("Received request: method=%s, id=%s, params=%s", request.method, request.id, request.params)
         
         try:
-            if request.method == "initialize":
-                return await self.handle_initialize(request)
-            elif request.method == "notifications/initialized":
-                # This is a notification, no response required
-                self.logger.info("Handled notifications/initialized")
-                return None
-            elif request.method == "tools/list":
-                return await self.handle_tools_list(request)
-            elif request.method == "tools/call":
-                return await self.handle_tools_call(request)
-            elif request.method == "resources/list":
-                return await self.handle_resources_list(request)
-            elif request.method == "resources/read":
-                return await self.handle_resources_read(request)
-            elif request.method == "prompts/list":
-                return await self.handle_prompts_list(request)
-            elif request.method.startswith("notifications/"):
-                # Handle other notifications (no response required)
-                self.logger.info(f"Handled notification: {request.method}")
+            method = request.method
+            handler = self._method_handlers.get(method)
+            if handler is not None:
+                return await handler(request)
+            
+            if method.startswith(self.NOTIFICATION_PREFIX):
+                # Notifications never get a response
+                self.logger.info(f"Handled notification: {method}")
                 return None
-            else:
-                self.logger.error(f"Unknown method: {request.method}")
-                return MCPResponse(
-                    jsonrpc="2.0",
-                    id=request.id,
-                    error={
-                        "code": -32601,
-                        "message": f"Method not found: {request.method}"
-                    }
-                )
+            
+            self.logger.error(f"Unknown method: {request.method}")
+            return _error_response(request.id, METHOD_NOT_FOUND, f"Method not found: {request.method}")
         except Exception as e:
             self.logger.error(f"Error handling request: {e}", exc_info=True)
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                error={
-                    "code": -32603,
-                    "message": f"Internal error: {str(e)}"
-                }
-            )
+            return _error_response(request.id, INTERNAL_ERROR, f"Internal error: {e}")
     
-    async def handle_initialize(self, request: MCPRequest) -> MCPResponse:
+    async def handle_initialize(self, request: MCPRequest) -> MCPResult:
         """Handle initialization request."""
-        return MCPResponse(
-            jsonrpc="2.0",
-            id=request.id,
-            result={
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {},
-                    "resources": {}
-                },
-                "serverInfo": {
-                    "name": "mcpuppet",
-                    "version": "1.0.0"
-                }
+        return _ok(request.id, {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {
+                "tools": {},
+                "resources": {}
+            },
+            "serverInfo": {
+                "name": "mcpuppet",
+                "version": "1.0.0"
             }
-        )
+        })
     
-    async def handle_tools_list(self, request: MCPRequest) -> MCPResponse:
+    async def handle_tools_list(self, request: MCPRequest) -> MCPResult:
         """List available tools."""
-        tools = [
-            {
-                "name": "execute_workflow",
-                "description": "Execute a workflow with the specified template and data",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "template_name": {
-                            "type": "string",
-                            "description": "Name of the workflow template to execute"
-                        },
-                        "session_id": {
-                            "type": "string",
-                            "description": "Unique session identifier for the workflow"
-                        },
-                        "data": {
-                            "type": "object",
-                            "description": "Data to process through the workflow"
-                        }
-                    },
-                    "required": ["template_name", "session_id", "data"]
-                }
-            },
-            {
-                "name": "call_tool",
-                "description": "Call a specific tool with policy enforcement",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "session_id": {
-                            "type": "string",
-                            "description": "Session identifier"
-                        },
-                        "tool_name": {
-                            "type": "string",
-                            "description": "Name of the tool to call"
-                        },
-                        "arguments": {
-                            "type": "object",
-                            "description": "Arguments to pass to the tool"
-                        }
-                    },
-                    "required": ["session_id", "tool_name", "arguments"]
-                }
-            },
-            {
-                "name": "get_workflow_status",
-                "description": "Get the status of a workflow session",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "session_id": {
-                            "type": "string",
-                            "description": "Session identifier"
-                        }
-                    },
-                    "required": ["session_id"]
-                }
-            },
-            {
-                "name": "list_templates",
-                "description": "List available workflow templates",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {}
-                }
-            },
-            {
-                "name": "get_audit_report",
-                "description": "Get comprehensive audit report for a session",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "session_id": {
-                            "type": "string",
-                            "description": "Session identifier (optional)"
-                        }
-                    }
-                }
-            }
-        ]
-        
-        return MCPResponse(
-            jsonrpc="2.0",
-            id=request.id,
-            result={"tools": tools}
-        )
+        return _ok(request.id, _TOOLS_LIST_RESULT)
     
-    async def handle_tools_call(self, request: MCPRequest) -> MCPResponse:
+    async def handle_tools_call(self, request: MCPRequest) -> MCPResult:
         """Handle tool calls."""
         params = request.params or {}
-        tool_name = params.get("name")
+        tool_name = _intern(params.get("name"))
         arguments = params.get("arguments", {})
         
-        self.logger.info(f"Tool call: name={tool_name}, arguments={arguments}")
+        self.logger.debug("Tool call: name=%s, arguments=%s", tool_name, arguments)
         
-        if tool_name == "execute_workflow":
-            return await self.execute_workflow(request.id, arguments)
-        elif tool_name == "call_tool":
-            return await self.call_tool(request.id, arguments)
-        elif tool_name == "get_workflow_status":
-            return await self.get_workflow_status(request.id, arguments)
-        elif tool_name == "list_templates":
-            return await self.list_templates(request.id, arguments)
-        elif tool_name == "get_audit_report":
-            return await self.get_audit_report(request.id, arguments)
-        else:
-            self.logger.error(f"Unknown tool: {tool_name}")
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                error={
-                    "code": -32602,
-                    "message": f"Unknown tool: {tool_name}"
-                }
-            )
+        handler = self._tool_handlers.get(tool_name)
+        if handler is not None:
+            return await handler(request.id, arguments)
+        
+        self.logger.error(f"Unknown tool: {tool_name}")
+        return _error_response(request.id, INVALID_PARAMS, f"Unknown tool: {tool_name}")
     
-    async def execute_workflow(self, request_id: str, arguments: Dict[str, Any]) -> MCPResponse:
+    async def execute_workflow(self, request_id: str, arguments: Dict[str, Any]) -> MCPResult:
         """Execute a complete workflow."""
         try:
             template_name = arguments["template_name"]
@@ -234,76 +296,74 @@ class MCPWorkflowServer:
             # Get workflow template
             template = self.template_manager.get_template(template_name)
             if not template:
-                return MCPResponse(
-                    jsonrpc="2.0",
-                    id=request_id,
-                    error={
-                        "code": -32602,
-                        "message": f"Template not found: {template_name}"
-                    }
-                )
+                return _error_response(request_id, INVALID_PARAMS, f"Template not found: {template_name}")
             
             # Execute workflow steps
             results = []
-            for step in template.steps:
-                result = await self.orchestrator.call_tool(
-                    session_id,
-                    step.tool_name,
-                    {"data": data}
-                )
-                results.append({
-                    "tool": step.tool_name,
-                    "success": result["success"],
-                    "result": result.get("result"),
-                    "error": result.get("error")
-                })
+            success_count = 0
+            if template.parallel:
+                # Steps within a wave have no dependencies on each other, so each wave runs together
+                # under the template's concurrency cap; a failed wave stops the ones that depend on it
+                semaphore = asyncio.Semaphore(template.max_concurrent)
                 
-                # Stop if step failed
-                if not result["success"]:
-                    break
+                async def run_step(step):
+                    async with semaphore:
+                        return await self.orchestrator.call_tool(session_id, step.tool_name, {"data": data})
+                
+                for wave in template.waves:
+                    step_results = await asyncio.gather(*(run_step(step) for step in wave))
+                    wave_failed = False
+                    for step, result in zip(wave, step_results):
+                        results.append(_step_summary(step.tool_name, result))
+                        if result["success"]:
+                            success_count += 1
+                        else:
+                            wave_failed = True
+                    if wave_failed:
+                        break
+            else:
+                for step in template.steps:
+                    result = await self.orchestrator.call_tool(
+                        session_id,
+                        step.tool_name,
+                        {"data": data}
+                    )
+                    results.append(_step_summary(step.tool_name, result))
+                    
+                    # Stop if step failed
+                    if not result["success"]:
+                        break
+                    success_count += 1
             
             # Get final status
             session_status = self.orchestrator.get_session_status(session_id)
             
             # Format response
-            success_count = sum(1 for r in results if r["success"])
             total_count = len(results)
             
-            result_text = f"Workflow '{template_name}' executed for session {session_id}\n\n"
-            result_text += f"Steps completed: {success_count}/{total_count}\n\n"
+            parts = [
+                f"Workflow '{template_name}' executed for session {session_id}",
+                "",
+                f"Steps completed: {success_count}/{total_count}",
+                ""
+            ]
             
             for i, result in enumerate(results, 1):
                 status = "✅" if result["success"] else "❌"
-                result_text += f"{i}. {status} {result['tool']}\n"
+                parts.append(f"{i}. {status} {result['tool']}")
                 if result.get("error"):
-                    result_text += f"   Error: {result['error']}\n"
+                    parts.append(f"   Error: {result['error']}")
             
-            result_text += f"\nSession Status: {session_status.get('status', 'unknown')}"
+            parts.append("")
+            parts.append(f"Session Status: {session_status.get('status', 'unknown')}")
+            result_text = "\n".join(parts)
             
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request_id,
-                result={
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": result_text
-                        }
-                    ]
-                }
-            )
+            return _text_result(request_id, result_text)
             
         except Exception as e:
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request_id,
-                error={
-                    "code": -32603,
-                    "message": f"Workflow execution failed: {str(e)}"
-                }
-            )
+            return _error_response(request_id, INTERNAL_ERROR, f"Workflow execution failed: {e}")
     
-    async def call_tool(self, request_id: str, arguments: Dict[str, Any]) -> MCPResponse:
+    async def call_tool(self, request_id: str, arguments: Dict[str, Any]) -> MCPResult:
         """Call a specific tool."""
         try:
             session_id = arguments["session_id"]
@@ -314,290 +374,259 @@ class MCPWorkflowServer:
             
             # Format response
             status = "✅ Success" if result.get("success") else "❌ Failed"
-            result_text = f"Tool '{tool_name}' called for session {session_id}\n\n"
-            result_text += f"Status: {status}\n"
+            parts = [f"Tool '{tool_name}' called for session {session_id}", "", f"Status: {status}"]
             
             if result.get("result"):
-                result_text += f"Result: {result['result']}\n"
+                parts.append(f"Result: {result['result']}")
             if result.get("error"):
-                result_text += f"Error: {result['error']}\n"
+                parts.append(f"Error: {result['error']}")
+            result_text = "\n".join(parts) + "\n"
             
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request_id,
-                result={
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": result_text
-                        }
-                    ]
-                }
-            )
+            return _text_result(request_id, result_text)
             
         except Exception as e:
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request_id,
-                error={
-                    "code": -32603,
-                    "message": f"Tool call failed: {str(e)}"
-                }
-            )
+            return _error_response(request_id, INTERNAL_ERROR, f"Tool call failed: {e}")
     
-    async def get_workflow_status(self, request_id: str, arguments: Dict[str, Any]) -> MCPResponse:
+    async def get_workflow_status(self, request_id: str, arguments: Dict[str, Any]) -> MCPResult:
         """Get workflow status."""
         try:
             session_id = arguments["session_id"]
             status = self.orchestrator.get_session_status(session_id)
             
             # Format response
-            result_text = f"Session {session_id} Status:\n\n"
-            result_text += f"Status: {status.get('status', 'unknown')}\n"
-            result_text += f"Tools called: {len(status.get('tools_called', []))}\n"
+            tools = status.get('tools_called', [])
+            parts = [
+                f"Session {session_id} Status:",
+                "",
+                f"Status: {status.get('status', 'unknown')}",
+                f"Tools called: {len(tools)}"
+            ]
             
             if status.get('current_step'):
-                result_text += f"Current step: {status['current_step']}\n"
+                parts.append(f"Current step: {status['current_step']}")
             
-            if status.get('tools_called'):
-                result_text += "\nTools called:\n"
-                for tool in status['tools_called']:
-                    result_text += f"  • {tool}\n"
+            if tools:
+                parts.append("")
+                parts.append("Tools called:")
+                parts.extend(f"  • {tool}" for tool in tools)
+            result_text = "\n".join(parts) + "\n"
             
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request_id,
-                result={
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": result_text
-                        }
-                    ]
-                }
-            )
+            return _text_result(request_id, result_text)
             
         except Exception as e:
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request_id,
-                error={
-                    "code": -32603,
-                    "message": f"Status retrieval failed: {str(e)}"
-                }
-            )
+            return _error_response(request_id, INTERNAL_ERROR, f"Status retrieval failed: {e}")
     
-    async def list_templates(self, request_id: str, arguments: Dict[str, Any]) -> MCPResponse:
-        """List available workflow templates."""
-        self.logger.info(f"list_templates called with arguments: {arguments}")
-        
-        try:
+    def _templates_views(self) -> Tuple[str, str]:
+        """Return the template listing text and JSON, rendered once per template set version."""
+        version = self.template_manager.version
+        if self._templates_cache is None or self._templates_cache[0] != version:
             templates = self.template_manager.list_templates()
             self.logger.info(f"Retrieved {len(templates)} templates: {[t.get('name', 'unnamed') for t in templates]}")
             
             # Format templates for display
-            template_list = []
-            for template in templates:
-                template_list.append(f"• {template.get('name', 'unnamed')}: {template.get('description', 'No description')}")
+            template_list = [
+                f"• {template.get('name', 'unnamed')}: {template.get('description', 'No description')}"
+                for template in templates
+            ]
+            listing_text = "Available workflow templates:\n\n" + "\n".join(template_list)
+            self._templates_cache = (version, listing_text, _encode_pretty(templates))
+        
+        return self._templates_cache[1], self._templates_cache[2]
+    
+    async def list_templates(self, request_id: str, arguments: Dict[str, Any]) -> MCPResult:
+        """List available workflow templates."""
+        self.logger.debug("list_templates called with arguments: %s", arguments)
+        
+        try:
+            listing_text, _ = self._templates_views()
             
-            result = {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Available workflow templates:\n\n" + "\n".join(template_list)
-                    }
-                ]
-            }
-            self.logger.info(f"Returning result: {result}")
+            self.logger.debug("Returning listing: %s", listing_text)
             
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request_id,
-                result=result
-            )
+            return _text_result(request_id, listing_text)
             
         except Exception as e:
             self.logger.error(f"Template listing failed: {e}", exc_info=True)
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request_id,
-                error={
-                    "code": -32603,
-                    "message": f"Template listing failed: {str(e)}"
-                }
-            )
+            return _error_response(request_id, INTERNAL_ERROR, f"Template listing failed: {e}")
     
-    async def get_audit_report(self, request_id: str, arguments: Dict[str, Any]) -> MCPResponse:
+    async def get_audit_report(self, request_id: str, arguments: Dict[str, Any]) -> MCPResult:
         """Get audit report."""
         try:
             session_id = arguments.get("session_id")
             report = self.orchestrator.audit_monitor.generate_compliance_report(session_id)
             
             # Format response
-            result_text = f"Audit Report" + (f" for session {session_id}" if session_id else "") + "\n\n"
-            result_text += f"Total sessions: {report.get('total_sessions', 0)}\n"
-            result_text += f"Policy violations: {report.get('policy_violations', 0)}\n"
-            result_text += f"Success rate: {report.get('success_rate', 0):.1%}\n"
+            parts = [
+                "Audit Report" + (f" for session {session_id}" if session_id else ""),
+                "",
+                f"Total sessions: {report.get('total_sessions', 0)}",
+                f"Policy violations: {report.get('policy_violations', 0)}",
+                f"Success rate: {report.get('success_rate', 0):.1%}"
+            ]
             
             if report.get('violations'):
-                result_text += "\nViolations:\n"
-                for violation in report['violations']:
-                    result_text += f"  • {violation}\n"
+                parts.append("")
+                parts.append("Violations:")
+                parts.extend(f"  • {violation}" for violation in report['violations'])
+            result_text = "\n".join(parts) + "\n"
             
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request_id,
-                result={
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": result_text
-                        }
-                    ]
-                }
-            )
+            return _text_result(request_id, result_text)
             
         except Exception as e:
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request_id,
-                error={
-                    "code": -32603,
-                    "message": f"Audit report generation failed: {str(e)}"
-                }
-            )
+            return _error_response(request_id, INTERNAL_ERROR, f"Audit report generation failed: {e}")
     
-    async def handle_resources_list(self, request: MCPRequest) -> MCPResponse:
+    async def handle_resources_list(self, request: MCPRequest) -> MCPResult:
         """List available resources."""
-        resources = [
-            {
-                "uri": "workflow://templates",
-                "name": "Workflow Templates",
-                "description": "Available workflow templates",
-                "mimeType": "application/json"
-            },
-            {
-                "uri": "workflow://config",
-                "name": "Configuration",
-                "description": "Current system configuration",
-                "mimeType": "application/json"
-            }
-        ]
-        
-        return MCPResponse(
-            jsonrpc="2.0",
-            id=request.id,
-            result={"resources": resources}
-        )
+        return _ok(request.id, _RESOURCES_LIST_RESULT)
     
-    async def handle_resources_read(self, request: MCPRequest) -> MCPResponse:
+    async def handle_resources_read(self, request: MCPRequest) -> MCPResult:
         """Read resource content."""
         params = request.params or {}
         uri = params.get("uri")
         
         if uri == "workflow://templates":
-            templates = self.template_manager.list_templates()
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                result={
-                    "contents": [
-                        {
-                            "uri": uri,
-                            "mimeType": "application/json",
-                            "text": json.dumps(templates, indent=2)
-                        }
-                    ]
-                }
-            )
+            _, templates_json = self._templates_views()
+            return _ok(request.id, {
+                "contents": [
+                    {
+                        "uri": uri,
+                        "mimeType": "application/json",
+                        "text": templates_json
+                    }
+                ]
+            })
         elif uri == "workflow://config":
             config = self.orchestrator.config
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                result={
-                    "contents": [
-                        {
-                            "uri": uri,
-                            "mimeType": "application/json",
-                            "text": json.dumps(config, indent=2)
-                        }
-                    ]
-                }
-            )
+            return _ok(request.id, {
+                "contents": [
+                    {
+                        "uri": uri,
+                        "mimeType": "application/json",
+                        "text": _encode_pretty(config)
+                    }
+                ]
+            })
         else:
-            return MCPResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                error={
-                    "code": -32602,
-                    "message": f"Resource not found: {uri}"
-                }
-            )
+            return _error_response(request.id, INVALID_PARAMS, f"Resource not found: {uri}")
     
-    async def handle_prompts_list(self, request: MCPRequest) -> MCPResponse:
+    async def handle_prompts_list(self, request: MCPRequest) -> MCPResult:
         """Handle prompts list request."""
         # Return empty prompts list - this server doesn't provide prompts
-        return MCPResponse(
-            jsonrpc="2.0",
-            id=request.id,
-            result={"prompts": []}
-        )
+        return _ok(request.id, {"prompts": []})
+    
+    async def _open_stdin_reader(self) -> Optional[asyncio.StreamReader]:
+        """Attach stdin to the event loop, or return None when it cannot be watched."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        try:
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        except (ValueError, OSError, NotImplementedError) as e:
+            # Regular files and some consoles are not pollable; fall back to a reader thread
+            self.logger.info(f"Reading stdin through a thread: {e}")
+            return None
+        return reader
+    
+    async def _read_lines(self, reader: Optional[asyncio.StreamReader]) -> List[bytes]:
+        """Wait for at least one line and return every complete line received; [] at EOF."""
+        if reader is None:
+            line = await asyncio.get_running_loop().run_in_executor(None, sys.stdin.readline)
+            return [line] if line else []
+        
+        pending = self._stdin_pending
+        has_line = b"\n" in pending
+        while not has_line:
+            chunk = await reader.read(STDIN_READ_CHUNK)
+            if not chunk:
+                # EOF: an unterminated last line is still a message
+                tail = bytes(pending)
+                pending.clear()
+                return [tail] if tail else []
+            if self._stdin_discarding:
+                newline = chunk.find(b"\n")
+                if newline < 0:
+                    continue
+                chunk = chunk[newline + 1:]
+                self._stdin_discarding = False
+            pending += chunk
+            if len(pending) > STDIN_LINE_LIMIT and b"\n" not in chunk:
+                self.logger.error(f"Dropping JSON-RPC message longer than {STDIN_LINE_LIMIT} bytes")
+                pending.clear()
+                self._stdin_discarding = True
+                continue
+            has_line = b"\n" in chunk
+        
+        end = pending.rindex(b"\n")
+        lines = bytes(pending[:end]).split(b"\n")
+        del pending[:end + 1]
+        return lines
+    
+    def _parse_line(self, line: bytes) -> Optional[MCPRequest]:
+        """Parse one JSON-RPC line, or log why it cannot be handled and return None."""
+        try:
+            # json.loads already skips the surrounding whitespace and newline
+            return MCPRequest.from_message(_decode(line))
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Invalid JSON: {e}")
+        except KeyError as e:
+            self.logger.error(f"Missing required field: {e}")
+        return None
+    
+    async def _handle_parsed(self, request: MCPRequest) -> Optional[bytes]:
+        """Handle one parsed request, returning the framed response if one is due."""
+        response = await self.handle_request(request)
+        
+        # Send response (only if not None - notifications don't get responses)
+        if response is None:
+            return None
+        
+        self.logger.debug("Sending response: %s", response)
+        if isinstance(response, bytes):
+            return response
+        return _encode_compact(response).encode("utf-8") + b"\n"
     
     async def run(self):
         """Run the MCP server."""
         self.logger.info("Starting MCPuppet Server")
         
-        # Read from stdin and write to stdout for MCP transport
+        # Read from stdin and write raw bytes to stdout for MCP transport
+        reader = await self._open_stdin_reader()
+        out = sys.stdout.buffer
+        
+        def flush(frames: List[bytes]):
+            out.write(b"".join(frames))
+            out.flush()
+            frames.clear()
         while True:
             try:
-                # Read JSON-RPC message from stdin
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, sys.stdin.readline
-                )
-                
-                if not line:
+                # Read every JSON-RPC message that has already arrived on stdin
+                lines = await self._read_lines(reader)
+                if not lines:
                     break
                 
-                # Parse request
-                try:
-                    request_data = json.loads(line.strip())
-                    request = MCPRequest(
-                        jsonrpc=request_data["jsonrpc"],
-                        id=request_data.get("id"),
-                        method=request_data["method"],
-                        params=request_data.get("params")
-                    )
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Invalid JSON: {e}")
-                    continue
-                except KeyError as e:
-                    self.logger.error(f"Missing required field: {e}")
-                    continue
-                
-                # Handle request
-                response = await self.handle_request(request)
-                
-                # Send response (only if not None - notifications don't get responses)
-                if response is not None:
-                    response_data = {
-                        "jsonrpc": response.jsonrpc,
-                        "id": response.id
-                    }
-                    
-                    if response.result is not None:
-                        response_data["result"] = response.result
-                    if response.error is not None:
-                        response_data["error"] = response.error
+                # Pipelined requests run one after another, since tools/call requests on a session
+                # must keep their order for policy checks; only the stdout write is batched, and it
+                # is flushed before any slow method so quick replies are not held behind it
+                frames = []
+                for line in lines:
+                    request = self._parse_line(line)
+                    if request is None:
+                        continue
+                    if frames and request.method in SLOW_METHODS:
+                        flush(frames)
                     
-                    self.logger.info(f"Sending response: {response_data}")
-                    print(json.dumps(response_data))
-                    sys.stdout.flush()
+                    frame = await self._handle_parsed(request)
+                    if frame is not None:
+                        frames.append(frame)
+                        if len(frames) >= MAX_PIPELINED_BATCH:
+                            flush(frames)
+                
+                if frames:
+                    flush(frames)
                 
             except Exception as e:
                 self.logger.error(f"Server error: {e}")
                 break
         
+        await self.orchestrator.aclose()
         self.logger.info("MCPuppet Server stopped")
 
 
@@ -607,6 +636,12 @@ async def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     os.chdir(script_dir)
     
+    # Setup logging once per process, before the server and orchestrator start logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     server = MCPWorkflowServer()
     await server.run()
 
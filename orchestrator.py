@@ -2,9 +2,11 @@ import asyncio
 import json
 import logging
 import os
-from typing import Dict, List, Any, Optional
-from datetime import datetime
-from dataclasses import dataclass
+import time
+from collections import deque
+from urllib.parse import urlsplit
+from typing import Deque, Dict, List, Any, Optional, Set, Tuple
+from datetime import datetime, timedelta
 from enum import Enum
 import httpx
 from pydantic import BaseModel
@@ -13,6 +15,17 @@ from audit_monitor import AuditMonitor
 from workflow_policies import WorkflowPolicyEngine
 
 
+# Downstream request bodies are encoded by one shared compact encoder instead of httpx's per-call json.dumps
+_encode_request = json.JSONEncoder(separators=(",", ":")).encode
+
+# Downstream responses are read in chunks; bodies past the threshold are parsed off the event loop
+RESPONSE_CHUNK_SIZE = 64 * 1024
+LARGE_RESPONSE_BYTES = 1024 * 1024
+
+# Tool calls kept per session; older ones drop off, while totals and completed tools are tracked separately
+MAX_RECENT_TOOL_CALLS = 1024
+
+
 class ToolCallStatus(Enum):
     PENDING = "pending"
     APPROVED = "approved"
@@ -21,39 +34,158 @@ class ToolCallStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
 class ToolCall:
-    id: str
-    tool_name: str
-    arguments: Dict[str, Any]
-    timestamp: datetime
-    status: ToolCallStatus
-    result: Optional[Any] = None
-    error: Optional[str] = None
+    # One per call, kept for the whole session; slotted so each record carries no instance dict
+    __slots__ = ("id", "tool_name", "arguments", "timestamp", "status", "result", "error")
+    
+    def __init__(self, id: str, tool_name: str, arguments: Dict[str, Any], timestamp: int,
+                 status: ToolCallStatus, result: Optional[Any] = None, error: Optional[str] = None):
+        self.id = id
+        self.tool_name = tool_name
+        self.arguments = arguments
+        # time.monotonic_ns() at creation; WorkflowSession.wall_time() turns it into a datetime
+        self.timestamp = timestamp
+        self.status = status
+        self.result = result
+        self.error = error
+
+
+# A call in one of these states may still be referenced by a running call_tool
+_IN_FLIGHT = frozenset((ToolCallStatus.PENDING, ToolCallStatus.APPROVED))
+
+
+class ToolCallPool:
+    """Free list of ToolCall records that dropped out of session history, reused for new calls."""
+    
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._free: Deque[ToolCall] = deque()
+    
+    def acquire(self, id: str, tool_name: str, arguments: Dict[str, Any], timestamp: int) -> ToolCall:
+        if not self._free:
+            return ToolCall(id, tool_name, arguments, timestamp, ToolCallStatus.PENDING)
+        tool_call = self._free.pop()
+        tool_call.id = id
+        tool_call.tool_name = tool_name
+        tool_call.arguments = arguments
+        tool_call.timestamp = timestamp
+        tool_call.status = ToolCallStatus.PENDING
+        return tool_call
+    
+    def release(self, tool_call: ToolCall):
+        if tool_call.status in _IN_FLIGHT or len(self._free) >= self.capacity:
+            return
+        # Drop references to the old call's payloads while the record waits for reuse
+        tool_call.arguments = None
+        tool_call.result = None
+        tool_call.error = None
+        self._free.append(tool_call)
+
+
+class CircuitBreaker:
+    """Fails calls to a downstream host fast once it keeps failing, until a cooldown has passed."""
+    
+    def __init__(self, failure_threshold: int = 5, failure_window: float = 10.0, cooldown: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.cooldown = cooldown
+        self.failures = 0
+        self.first_failure_at = 0.0
+        self.opened_at: Optional[float] = None
+    
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        # After the cooldown calls go through again as a trial; one more failure reopens the circuit
+        return time.monotonic() - self.opened_at >= self.cooldown
+    
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self):
+        now = time.monotonic()
+        if self.opened_at is not None:
+            self.opened_at = now
+            return
+        if self.failures == 0 or now - self.first_failure_at > self.failure_window:
+            self.failures = 0
+            self.first_failure_at = now
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = now
 
 
 class WorkflowSession:
     def __init__(self, session_id: str):
         self.session_id = session_id
-        self.tool_calls: List[ToolCall] = []
+        self.tool_calls: Deque[ToolCall] = deque(maxlen=MAX_RECENT_TOOL_CALLS)
+        self.total_calls = 0
+        self._call_id_prefix = f"{session_id}_"
         self.state: Dict[str, Any] = {}
+        # The only wall-clock read per session; later timestamps are monotonic offsets from it
         self.start_time = datetime.now()
-        self.active_workflow: Optional[str] = None
+        self.start_ns = time.monotonic_ns()
+        # Bumped whenever a field changes outside call_tool, so cached status views can tell
+        self.revision = 0
+        self._active_workflow: Optional[str] = None
+        
+        # Kept up to date as calls finish, so no lookup has to rescan tool_calls
+        self._completed: List[str] = []
+        self._failed: List[str] = []
+        self.completed_set: Set[str] = set()
+    
+    @property
+    def active_workflow(self) -> Optional[str]:
+        return self._active_workflow
+    
+    @active_workflow.setter
+    def active_workflow(self, workflow: Optional[str]):
+        self._active_workflow = workflow
+        self.revision += 1
     
-    def add_tool_call(self, tool_call: ToolCall):
+    def wall_time(self, monotonic_ns: int) -> datetime:
+        return self.start_time + timedelta(microseconds=(monotonic_ns - self.start_ns) / 1000)
+    
+    def next_call_id(self) -> str:
+        # Numbered by the lifetime call counter, which keeps growing after old calls are evicted
+        return self._call_id_prefix + str(self.total_calls)
+    
+    def add_tool_call(self, tool_call: ToolCall) -> Optional[ToolCall]:
+        """Record a call, returning the oldest one if the history was full and it dropped out."""
+        evicted = self.tool_calls[0] if len(self.tool_calls) == self.tool_calls.maxlen else None
         self.tool_calls.append(tool_call)
+        self.total_calls += 1
+        return evicted
+    
+    def mark_completed(self, tool_call: ToolCall):
+        tool_call.status = ToolCallStatus.COMPLETED
+        self._completed.append(tool_call.tool_name)
+        self.completed_set.add(tool_call.tool_name)
+    
+    def mark_failed(self, tool_call: ToolCall):
+        tool_call.status = ToolCallStatus.FAILED
+        self._failed.append(tool_call.tool_name)
     
     def get_completed_tools(self) -> List[str]:
-        return [
-            call.tool_name for call in self.tool_calls 
-            if call.status == ToolCallStatus.COMPLETED
-        ]
+        return list(self._completed)
     
     def get_failed_tools(self) -> List[str]:
-        return [
-            call.tool_name for call in self.tool_calls 
-            if call.status == ToolCallStatus.FAILED
-        ]
+        return list(self._failed)
+
+
+async def _close_with_loop(client: httpx.AsyncClient):
+    # Runs as a task on the client's loop until cancelled, then closes the client there. asyncio.run
+    # cancels leftover tasks before it closes the loop, so the pool is closed while its loop is alive.
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await client.aclose()
+
+
+def _copy_status(status: Dict[str, Any]) -> Dict[str, Any]:
+    # The tool lists are tuples already; the status and its state snapshot are per caller
+    return {**status, "current_state": dict(status["current_state"])}
 
 
 class MCPOrchestrator:
@@ -63,10 +195,30 @@ class MCPOrchestrator:
         if not os.path.isabs(config_path):
             config_path = os.path.join(os.path.dirname(__file__), config_path)
         self.config = self._load_config(config_path)
-        self.audit_monitor = AuditMonitor()
+        audit_settings = self.config.get("audit_settings", {})
+        self.audit_monitor = AuditMonitor(
+            async_logging=audit_settings.get("async_logging", False),
+            retention_days=audit_settings.get("retention_days")
+        )
         self.policy_engine = WorkflowPolicyEngine(self.config)
         self.sessions: Dict[str, WorkflowSession] = {}
+        self._tool_call_pool = ToolCallPool()
+        
+        # Status snapshots per session, reused until the session's change counter moves
+        self._session_seq: Dict[str, int] = {}
+        self._session_status_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
         self.downstream_servers: Dict[str, str] = self.config.get("downstream_servers", {})
+        
+        # One pooled client for all downstream calls, opened lazily on the loop that uses it
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Task on that loop that owns closing the client; see _close_with_loop
+        self._http_guard: Optional[asyncio.Task] = None
+        # Caps in-flight calls per downstream host when tools run concurrently
+        self.max_calls_per_server: int = self.config.get("max_concurrent_calls_per_server", 10)
+        self._server_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Per downstream host; unlike the semaphores these hold no loop state and live for the orchestrator
+        self._breakers: Dict[str, CircuitBreaker] = {}
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         try:
@@ -94,20 +246,22 @@ class MCPOrchestrator:
     def get_session(self, session_id: str) -> Optional[WorkflowSession]:
         return self.sessions.get(session_id)
     
+    def _mark_session_dirty(self, session_id: str):
+        self._session_seq[session_id] = self._session_seq.get(session_id, 0) + 1
+    
     async def call_tool(self, session_id: str, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         session = self.get_session(session_id)
         if not session:
             session = self.create_session(session_id)
         
-        tool_call = ToolCall(
-            id=f"{session_id}_{len(session.tool_calls)}",
-            tool_name=tool_name,
-            arguments=arguments,
-            timestamp=datetime.now(),
-            status=ToolCallStatus.PENDING
+        tool_call = self._tool_call_pool.acquire(
+            session.next_call_id(), tool_name, arguments, time.monotonic_ns()
         )
         
-        session.add_tool_call(tool_call)
+        evicted = session.add_tool_call(tool_call)
+        if evicted is not None:
+            self._tool_call_pool.release(evicted)
+        self._mark_session_dirty(session_id)
         
         # Log the attempt
         self.audit_monitor.log_tool_call_attempt(session_id, tool_name, arguments)
@@ -115,7 +269,7 @@ class MCPOrchestrator:
         try:
             # Check policy enforcement
             policy_result = self.policy_engine.can_execute_tool(
-                tool_name, session.get_completed_tools(), session.state
+                tool_name, session.completed_set, session.state
             )
             
             if not policy_result.allowed:
@@ -146,7 +300,7 @@ class MCPOrchestrator:
             # Execute the tool call
             result = await self._execute_downstream_tool(tool_name, arguments)
             
-            tool_call.status = ToolCallStatus.COMPLETED
+            session.mark_completed(tool_call)
             tool_call.result = result
             
             # Update session state
@@ -163,7 +317,7 @@ class MCPOrchestrator:
             }
             
         except Exception as e:
-            tool_call.status = ToolCallStatus.FAILED
+            session.mark_failed(tool_call)
             tool_call.error = str(e)
             
             self.audit_monitor.log_tool_call_completion(
@@ -175,29 +329,115 @@ class MCPOrchestrator:
                 "error": str(e),
                 "tool_call_id": tool_call.id
             }
+        
+        finally:
+            # Every exit path has changed the call's status or the session state
+            self._mark_session_dirty(session_id)
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop:
+            # Pooled connections belong to the loop that opened them, so a new loop gets a new client.
+            # The old client was closed by its guard when its loop shut down; a loop still running
+            # in another thread has its guard cancelled there.
+            if self._http_guard is not None and self._http_loop.is_running():
+                self._http_loop.call_soon_threadsafe(self._http_guard.cancel)
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                headers={"content-type": "application/json"},
+                timeout=30.0
+            )
+            self._http_loop = loop
+            self._http_guard = loop.create_task(_close_with_loop(self._http))
+            self._server_semaphores = {}
+        return self._http
+    
+    def _server_semaphore(self, server_url: str) -> asyncio.Semaphore:
+        host = urlsplit(server_url).netloc
+        semaphore = self._server_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._server_semaphores[host] = asyncio.Semaphore(self.max_calls_per_server)
+        return semaphore
+    
+    def _breaker(self, server_url: str) -> CircuitBreaker:
+        host = urlsplit(server_url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker()
+        return breaker
+    
+    async def aclose(self):
+        """Close the pooled downstream HTTP client."""
+        guard = self._http_guard
+        if guard is not None:
+            self._http = None
+            self._http_loop = None
+            self._http_guard = None
+            # The guard does the one close; wait() rather than await so its cancellation is not re-raised here
+            guard_loop = guard.get_loop()
+            if guard_loop is asyncio.get_running_loop():
+                guard.cancel()
+                await asyncio.wait({guard})
+            elif guard_loop.is_running():
+                guard_loop.call_soon_threadsafe(guard.cancel)
+    
+    async def call_tools_batch(self, session_id: str, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Run independent (tool_name, arguments) calls concurrently; results come back in call order."""
+        # Policies are checked as each call starts, so a batch should only hold tools that are
+        # ready together, e.g. those from get_ready_tools()
+        return await asyncio.gather(*(
+            self.call_tool(session_id, tool_name, arguments) for tool_name, arguments in calls
+        ))
+    
+    def get_ready_tools(self, session_id: str) -> List[str]:
+        session = self.get_session(session_id)
+        completed_tools = session.completed_set if session else set()
+        active_workflow = session.active_workflow if session else None
+        return self.policy_engine.get_next_allowed_tools(completed_tools, active_workflow)
     
     async def _execute_downstream_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
         server_url = self.downstream_servers.get(tool_name)
         if not server_url:
             raise ValueError(f"No downstream server configured for tool: {tool_name}")
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
+        breaker = self._breaker(server_url)
+        if not breaker.allow():
+            raise ConnectionError(f"Downstream server {server_url} is not available: circuit open after repeated failures")
+        
+        client = self._get_http_client()
+        try:
+            async with self._server_semaphore(server_url):
+                async with client.stream(
+                    "POST",
                     f"{server_url}/call_tool",
-                    json={"tool_name": tool_name, "arguments": arguments},
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.RequestError as e:
-                # Downstream server failure - raise the error to be properly recorded
-                self.logger.error(f"Downstream server {server_url} failed: {e}")
-                raise ConnectionError(f"Downstream server {server_url} is not available: {e}")
-            except httpx.HTTPStatusError as e:
-                # HTTP error response from server
-                self.logger.error(f"Downstream server {server_url} returned error {e.response.status_code}: {e.response.text}")
-                raise RuntimeError(f"Downstream server {server_url} returned error {e.response.status_code}: {e.response.text}")
+                    content=_encode_request({"tool_name": tool_name, "arguments": arguments}).encode("utf-8")
+                ) as response:
+                    if response.is_error:
+                        # Error bodies go into the raised message, so read them in full
+                        await response.aread()
+                    response.raise_for_status()
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes(RESPONSE_CHUNK_SIZE):
+                        body += chunk
+            breaker.record_success()
+            
+            # Parse the raw bytes; response.json() would decode them to text first
+            if len(body) > LARGE_RESPONSE_BYTES:
+                return await asyncio.to_thread(json.loads, body)
+            return json.loads(body)
+        except httpx.RequestError as e:
+            # Downstream server failure - raise the error to be properly recorded
+            breaker.record_failure()
+            self.logger.error(f"Downstream server {server_url} failed: {e}")
+            raise ConnectionError(f"Downstream server {server_url} is not available: {e}")
+        except httpx.HTTPStatusError as e:
+            # HTTP error response from server; only server-side errors count against the host
+            if e.response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            self.logger.error(f"Downstream server {server_url} returned error {e.response.status_code}: {e.response.text}")
+            raise RuntimeError(f"Downstream server {server_url} returned error {e.response.status_code}: {e.response.text}")
     
     
     async def _request_approval(self, session_id: str, tool_name: str, arguments: Dict[str, Any]) -> bool:
@@ -218,18 +458,29 @@ class MCPOrchestrator:
         if not session:
             return {"error": "Session not found"}
         
-        completed_tools = session.get_completed_tools()
-        failed_tools = session.get_failed_tools()
+        # Calls mark the session dirty; direct field changes bump its revision
+        seq = (self._session_seq.get(session_id, 0), session.revision)
+        cached = self._session_status_cache.get(session_id)
+        if cached and cached[0] == seq:
+            return _copy_status(cached[1])
+        
+        # Tuples and a state snapshot, so the cached status never aliases anything a caller can edit
+        completed_tools = tuple(session._completed)
+        failed_tools = tuple(session._failed)
         
-        return {
+        status = {
             "session_id": session_id,
             "start_time": session.start_time.isoformat(),
             "active_workflow": session.active_workflow,
-            "total_calls": len(session.tool_calls),
+            "total_calls": session.total_calls,
             "completed_tools": completed_tools,
             "failed_tools": failed_tools,
-            "current_state": session.state
+            "completed_count": len(completed_tools),
+            "failed_count": len(failed_tools),
+            "current_state": dict(session.state)
         }
+        self._session_status_cache[session_id] = (seq, status)
+        return _copy_status(status)
     
     def get_all_sessions_status(self) -> List[Dict[str, Any]]:
         return [self.get_session_status(sid) for sid in self.sessions.keys()]
\ No newline at end of file
@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflow_templates import WorkflowTemplateManager
+
+
+def _data_pipeline():
+    return WorkflowTemplateManager().get_template("data_pipeline")
+
+
+def test_result_written_after_completion_unblocks_dependent():
+    template = _data_pipeline()
+    execution = template.start_execution()
+    
+    # Nothing is known about the result yet, so process_data is held back
+    assert execution.notify_completed("validate_data", {}) == ()
+    
+    session_state = {"validate_data_result": {"valid": True}}
+    expected = template.get_next_executable_steps(["validate_data"], [], session_state)
+    assert [step.tool_name for step in expected] == ["process_data"]
+    assert execution.get_next_executable_steps(session_state) == expected
+
+
+def test_next_steps_follow_the_state_passed_in():
+    template = _data_pipeline()
+    execution = template.start_execution()
+    execution.mark_completed("validate_data")
+    
+    assert execution.get_next_executable_steps({"validate_data_result": {"valid": False}}) == ()
+    ready = execution.get_next_executable_steps({"validate_data_result": {"valid": True}})
+    assert [step.tool_name for step in ready] == ["process_data"]
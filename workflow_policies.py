@@ -1,207 +1,182 @@
-from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass
-from enum import Enum
-import json
+from typing import Callable, Dict, FrozenSet, List, Any, Optional, Sequence, Set, Tuple
+import functools
 
 
-class PolicyType(Enum):
-    SEQUENTIAL_DEPENDENCY = "sequential_dependency"
-    PARALLEL_RESTRICTION = "parallel_restriction"
-    CONDITIONAL_EXECUTION = "conditional_execution"
-    APPROVAL_REQUIRED = "approval_required"
-    WORKFLOW_TEMPLATE = "workflow_template"
+class PolicyResult:
+    # Built on every policy check; slotted, and tools with nothing to suggest share one empty tuple
+    __slots__ = ("allowed", "reason", "requires_approval", "suggested_next_tools")
+    
+    def __init__(self, allowed: bool, reason: str, requires_approval: bool = False,
+                 suggested_next_tools: Sequence[str] = ()):
+        self.allowed = allowed
+        self.reason = reason
+        self.requires_approval = requires_approval
+        self.suggested_next_tools = suggested_next_tools
 
 
-@dataclass
-class PolicyResult:
-    allowed: bool
-    reason: str
-    requires_approval: bool = False
-    suggested_next_tools: List[str] = None
+# Tools considered for next steps when the config does not list its downstream servers
+_DEFAULT_TOOLS = ("validate_data", "process_data", "backup_data", "send_notification", "require_approval")
+
+# Returned whenever nothing blocks or flags a tool; callers only read results, so one instance serves all
+_ALLOWED = PolicyResult(allowed=True, reason="All policies satisfied")
+
+
+def _always_met(result: Any) -> bool:
+    return True
+
+
+def _compile_criteria(criteria: Dict[str, Any]) -> Callable[[Any], bool]:
+    """Turn success criteria into a predicate on a tool result, interpreting the config only once."""
+    # Simple success criteria checking
+    if not criteria or "must_contain" not in criteria:
+        return _always_met
+    
+    required_keys = _as_tuple(criteria["must_contain"])
     
-    def __post_init__(self):
-        if self.suggested_next_tools is None:
-            self.suggested_next_tools = []
+    def meets_criteria(result: Any) -> bool:
+        # Only dict results are checked; each required key must be present and truthy
+        return not isinstance(result, dict) or all(result.get(key) for key in required_keys)
+    
+    return meets_criteria
+
+
+def _as_set(tools: Any) -> Set[str]:
+    # Membership checks run against a set; callers may still pass a list of completed tools
+    return tools if isinstance(tools, (set, frozenset)) else set(tools)
+
+
+def _as_tuple(tools: Any) -> Tuple[str, ...]:
+    # Policy config accepts either a single tool name or a list of them
+    return (tools,) if isinstance(tools, str) else tuple(tools)
 
 
-class WorkflowPolicy:
-    def __init__(self, policy_type: PolicyType, config: Dict[str, Any]):
-        self.policy_type = policy_type
-        self.config = config
+class CompiledToolRule:
+    """Every configured policy for one tool, merged at load time and checked in policy order."""
     
-    def evaluate(self, tool_name: str, completed_tools: List[str], session_state: Dict[str, Any]) -> PolicyResult:
-        if self.policy_type == PolicyType.SEQUENTIAL_DEPENDENCY:
-            return self._evaluate_sequential_dependency(tool_name, completed_tools)
-        elif self.policy_type == PolicyType.PARALLEL_RESTRICTION:
-            return self._evaluate_parallel_restriction(tool_name, completed_tools)
-        elif self.policy_type == PolicyType.CONDITIONAL_EXECUTION:
-            return self._evaluate_conditional_execution(tool_name, completed_tools, session_state)
-        elif self.policy_type == PolicyType.APPROVAL_REQUIRED:
-            return self._evaluate_approval_required(tool_name)
-        else:
-            return PolicyResult(allowed=True, reason="No policy applies")
+    def __init__(self):
+        self.dependencies: Tuple[str, ...] = ()
+        self.conflicts: Tuple[str, ...] = ()
+        self.requires_success: Optional[str] = None
+        self.result_key: Optional[str] = None
+        self.meets_criteria: Callable[[Any], bool] = _always_met
+        self.requires_approval = False
+    
+    @property
+    def uses_session_state(self) -> bool:
+        # Only the success condition looks at earlier results; every other check depends on completed tools alone
+        return self.requires_success is not None
     
-    def _evaluate_sequential_dependency(self, tool_name: str, completed_tools: List[str]) -> PolicyResult:
-        dependencies = self.config.get("dependencies", {})
+    def check(self, completed_tools: Set[str], session_state: Dict[str, Any]) -> Optional[PolicyResult]:
+        """Return the blocking or approval result, or None when the tool may simply run."""
+        missing_deps = [dep for dep in self.dependencies if dep not in completed_tools]
+        if missing_deps:
+            return PolicyResult(
+                allowed=False,
+                reason=f"Missing required dependencies: {', '.join(missing_deps)}",
+                suggested_next_tools=missing_deps
+            )
         
-        if tool_name in dependencies:
-            required_tools = dependencies[tool_name]
-            if isinstance(required_tools, str):
-                required_tools = [required_tools]
-            
-            missing_deps = [dep for dep in required_tools if dep not in completed_tools]
-            
-            if missing_deps:
+        conflicts = [tool for tool in self.conflicts if tool in completed_tools]
+        if conflicts:
+            return PolicyResult(
+                allowed=False,
+                reason=f"Cannot run in parallel with: {', '.join(conflicts)}"
+            )
+        
+        required_tool = self.requires_success
+        if required_tool is not None:
+            if required_tool not in completed_tools:
                 return PolicyResult(
                     allowed=False,
-                    reason=f"Missing required dependencies: {', '.join(missing_deps)}",
-                    suggested_next_tools=missing_deps
+                    reason=f"Requires successful completion of {required_tool}"
                 )
-        
-        return PolicyResult(allowed=True, reason="All dependencies satisfied")
-    
-    def _evaluate_parallel_restriction(self, tool_name: str, completed_tools: List[str]) -> PolicyResult:
-        restrictions = self.config.get("restrictions", {})
-        
-        if tool_name in restrictions:
-            conflicting_tools = restrictions[tool_name]
-            if isinstance(conflicting_tools, str):
-                conflicting_tools = [conflicting_tools]
-            
-            conflicts = [tool for tool in conflicting_tools if tool in completed_tools]
             
-            if conflicts:
+            result_key = self.result_key
+            if result_key in session_state and not self.meets_criteria(session_state[result_key]):
                 return PolicyResult(
                     allowed=False,
-                    reason=f"Cannot run in parallel with: {', '.join(conflicts)}"
+                    reason=f"Required tool {required_tool} did not meet success criteria"
                 )
         
-        return PolicyResult(allowed=True, reason="No parallel restrictions violated")
-    
-    def _evaluate_conditional_execution(self, tool_name: str, completed_tools: List[str], session_state: Dict[str, Any]) -> PolicyResult:
-        conditions = self.config.get("conditions", {})
-        
-        if tool_name in conditions:
-            condition = conditions[tool_name]
-            
-            # Check if required tool completed successfully
-            if "requires_success" in condition:
-                required_tool = condition["requires_success"]
-                if required_tool not in completed_tools:
-                    return PolicyResult(
-                        allowed=False,
-                        reason=f"Requires successful completion of {required_tool}"
-                    )
-                
-                # Check if the result meets success criteria
-                result_key = f"{required_tool}_result"
-                if result_key in session_state:
-                    result = session_state[result_key]
-                    if not self._check_success_condition(result, condition.get("success_criteria", {})):
-                        return PolicyResult(
-                            allowed=False,
-                            reason=f"Required tool {required_tool} did not meet success criteria"
-                        )
-        
-        return PolicyResult(allowed=True, reason="Conditional requirements satisfied")
-    
-    def _evaluate_approval_required(self, tool_name: str) -> PolicyResult:
-        required_tools = self.config.get("required_for", [])
-        if isinstance(required_tools, str):
-            required_tools = [required_tools]
-        
-        if tool_name in required_tools:
+        if self.requires_approval:
             return PolicyResult(
                 allowed=True,
                 reason="Manual approval required",
                 requires_approval=True
             )
         
-        return PolicyResult(allowed=True, reason="No approval required")
-    
-    def _check_success_condition(self, result: Any, criteria: Dict[str, Any]) -> bool:
-        if not criteria:
-            return True
-        
-        # Simple success criteria checking
-        if "must_contain" in criteria:
-            required_keys = criteria["must_contain"]
-            if isinstance(required_keys, str):
-                required_keys = [required_keys]
-            
-            if isinstance(result, dict):
-                for key in required_keys:
-                    if key not in result or not result[key]:
-                        return False
-        
-        return True
+        return None
 
 
 class WorkflowTemplate:
     def __init__(self, name: str, steps: List[Dict[str, Any]]):
         self.name = name
         self.steps = steps
+        # Step metadata as parallel tuples, derived once so lookups never touch the step dicts
+        self._tool_names = tuple(step["tool"] for step in steps)
+        self._dependencies = tuple(frozenset(step.get("dependencies", ())) for step in steps)
+        self._tool_set = frozenset(self._tool_names)
+        self._total = len(steps)
     
-    def get_next_allowed_tools(self, completed_tools: List[str]) -> List[str]:
-        allowed_tools = []
-        
-        for step in self.steps:
-            tool_name = step["tool"]
-            dependencies = step.get("dependencies", [])
-            
-            if tool_name not in completed_tools:
-                # Check if all dependencies are satisfied
-                if all(dep in completed_tools for dep in dependencies):
-                    allowed_tools.append(tool_name)
-        
-        return allowed_tools
+    def get_next_allowed_tools(self, completed_tools: Set[str]) -> List[str]:
+        completed_tools = _as_set(completed_tools)
+        # Steps not yet run whose dependencies are all satisfied
+        return [
+            tool_name for tool_name, dependencies in zip(self._tool_names, self._dependencies)
+            if tool_name not in completed_tools and dependencies <= completed_tools
+        ]
     
-    def is_workflow_complete(self, completed_tools: List[str]) -> bool:
-        required_tools = [step["tool"] for step in self.steps]
-        return all(tool in completed_tools for tool in required_tools)
+    def is_workflow_complete(self, completed_tools: Set[str]) -> bool:
+        return self._tool_set <= _as_set(completed_tools)
 
 
 class WorkflowPolicyEngine:
     def __init__(self, config: Dict[str, Any]):
-        self.policies: List[WorkflowPolicy] = []
         self.templates: Dict[str, WorkflowTemplate] = {}
+        # tool name -> merged rule; tools without an entry have no policy at all
+        self._rules: Dict[str, CompiledToolRule] = {}
+        # Decisions for rules that ignore session state, reused per (tool, completed tools)
+        self._cached_decision = functools.lru_cache(maxsize=2048)(self._decide)
         self._load_policies(config)
         self._load_templates(config)
+        self._compile_ready_checks(config)
     
     def _load_policies(self, config: Dict[str, Any]):
-        policies_config = config.get("policies", {})
+        self._compile_rules(config.get("policies", {}))
+    
+    def _compile_rules(self, policies_config: Dict[str, Any]):
+        rules = self._rules
         
-        # Load sequential dependencies
-        if "sequential_dependencies" in policies_config:
-            policy = WorkflowPolicy(
-                PolicyType.SEQUENTIAL_DEPENDENCY,
-                {"dependencies": policies_config["sequential_dependencies"]}
-            )
-            self.policies.append(policy)
+        for tool_name, required_tools in policies_config.get("sequential_dependencies", {}).items():
+            rules.setdefault(tool_name, CompiledToolRule()).dependencies = _as_tuple(required_tools)
         
-        # Load parallel restrictions
-        if "parallel_restrictions" in policies_config:
-            policy = WorkflowPolicy(
-                PolicyType.PARALLEL_RESTRICTION,
-                {"restrictions": policies_config["parallel_restrictions"]}
-            )
-            self.policies.append(policy)
+        for tool_name, conflicting_tools in policies_config.get("parallel_restrictions", {}).items():
+            rules.setdefault(tool_name, CompiledToolRule()).conflicts = _as_tuple(conflicting_tools)
         
-        # Load conditional execution rules
-        if "conditional_execution" in policies_config:
-            policy = WorkflowPolicy(
-                PolicyType.CONDITIONAL_EXECUTION,
-                {"conditions": policies_config["conditional_execution"]}
-            )
-            self.policies.append(policy)
+        for tool_name, condition in policies_config.get("conditional_execution", {}).items():
+            if "requires_success" in condition:
+                rule = rules.setdefault(tool_name, CompiledToolRule())
+                rule.requires_success = condition["requires_success"]
+                rule.result_key = f"{rule.requires_success}_result"
+                rule.meets_criteria = _compile_criteria(condition.get("success_criteria", {}))
         
-        # Load approval requirements
-        if "approval_required" in policies_config:
-            policy = WorkflowPolicy(
-                PolicyType.APPROVAL_REQUIRED,
-                {"required_for": policies_config["approval_required"]}
-            )
-            self.policies.append(policy)
+        for tool_name in _as_tuple(policies_config.get("approval_required", ())):
+            rules.setdefault(tool_name, CompiledToolRule()).requires_approval = True
+    
+    def _compile_ready_checks(self, config: Dict[str, Any]):
+        # (tool, tools that must have completed, tools that must not have) for every known tool.
+        # With no session state to judge, a success condition only needs its tool completed.
+        checks = []
+        for tool in config.get("downstream_servers") or _DEFAULT_TOOLS:
+            rule = self._rules.get(tool)
+            if rule is None:
+                checks.append((tool, frozenset(), frozenset()))
+                continue
+            prerequisites = set(rule.dependencies)
+            if rule.requires_success is not None:
+                prerequisites.add(rule.requires_success)
+            checks.append((tool, frozenset(prerequisites), frozenset(rule.conflicts)))
+        self._ready_checks: Tuple[Tuple[str, FrozenSet[str], FrozenSet[str]], ...] = tuple(checks)
     
     def _load_templates(self, config: Dict[str, Any]):
         templates_config = config.get("workflow_templates", {})
@@ -213,49 +188,48 @@ class WorkflowPolicyEngine:
             )
             self.templates[template_name] = template
     
-    def can_execute_tool(self, tool_name: str, completed_tools: List[str], session_state: Dict[str, Any]) -> PolicyResult:
-        for policy in self.policies:
-            result = policy.evaluate(tool_name, completed_tools, session_state)
-            
-            if not result.allowed:
-                return result
-            
-            # If approval is required, we still allow execution but mark it
-            if result.requires_approval:
-                return result
+    def can_execute_tool(self, tool_name: str, completed_tools: Set[str], session_state: Dict[str, Any]) -> PolicyResult:
+        # One lookup finds every policy that applies to the tool; most tools have none
+        rule = self._rules.get(tool_name)
+        if rule is None:
+            return _ALLOWED
+        
+        if rule.uses_session_state:
+            result = rule.check(_as_set(completed_tools), session_state)
+        else:
+            result = self._cached_decision(tool_name, frozenset(completed_tools))
         
-        return PolicyResult(allowed=True, reason="All policies satisfied")
+        # A blocked tool, or one that needs approval (still allowed, but marked)
+        return result if result is not None else _ALLOWED
     
-    def get_next_allowed_tools(self, completed_tools: List[str], active_template: Optional[str] = None) -> List[str]:
+    def _decide(self, tool_name: str, completed_tools: FrozenSet[str]) -> Optional[PolicyResult]:
+        return self._rules[tool_name].check(completed_tools, {})
+    
+    def get_next_allowed_tools(self, completed_tools: Set[str], active_template: Optional[str] = None) -> List[str]:
+        completed_tools = _as_set(completed_tools)
         if active_template and active_template in self.templates:
             return self.templates[active_template].get_next_allowed_tools(completed_tools)
         
         # If no template is active, return all tools that don't have unmet dependencies
-        all_tools = {"validate_data", "process_data", "backup_data", "send_notification", "require_approval"}
-        allowed_tools = []
-        
-        for tool in all_tools:
-            if tool not in completed_tools:
-                # Check if this tool can be executed given current state
-                result = self.can_execute_tool(tool, completed_tools, {})
-                if result.allowed:
-                    allowed_tools.append(tool)
-        
-        return allowed_tools
+        return [
+            tool for tool, prerequisites, conflicts in self._ready_checks
+            if tool not in completed_tools and prerequisites <= completed_tools and conflicts.isdisjoint(completed_tools)
+        ]
     
-    def get_workflow_progress(self, completed_tools: List[str], active_template: Optional[str] = None) -> Dict[str, Any]:
+    def get_workflow_progress(self, completed_tools: Set[str], active_template: Optional[str] = None) -> Dict[str, Any]:
         if active_template and active_template in self.templates:
             template = self.templates[active_template]
-            total_steps = len(template.steps)
-            completed_steps = len([step for step in template.steps if step["tool"] in completed_tools])
+            completed_set = _as_set(completed_tools)
+            total_steps = template._total
+            completed_steps = sum(1 for tool_name in template._tool_names if tool_name in completed_set)
             
             return {
                 "template": active_template,
                 "total_steps": total_steps,
                 "completed_steps": completed_steps,
                 "progress_percent": (completed_steps / total_steps) * 100 if total_steps > 0 else 0,
-                "is_complete": template.is_workflow_complete(completed_tools),
-                "next_allowed_tools": template.get_next_allowed_tools(completed_tools)
+                "is_complete": template.is_workflow_complete(completed_set),
+                "next_allowed_tools": template.get_next_allowed_tools(completed_set)
             }
         
         return {
@@ -1,5 +1,6 @@
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import sys
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Iterable, Set, FrozenSet, Tuple, Mapping, Callable
 from enum import Enum
 
 
@@ -10,106 +11,280 @@ class WorkflowStepType(Enum):
     APPROVAL_GATE = "approval_gate"
 
 
-@dataclass
+_MISSING = object()
+
+
+class _PlainEqMatcher:
+    __slots__ = ("expected",)
+    
+    def __init__(self, expected: Any):
+        self.expected = expected
+    
+    def __call__(self, actual: Any) -> bool:
+        return actual == self.expected
+
+
+class _EqMatcher(_PlainEqMatcher):
+    # {"equals": v}; the wrapped value is compared, not the condition dict
+    __slots__ = ()
+
+
+class _SuccessMatcher:
+    # {"success": v}: dict results compare their "success" flag, anything else the whole condition
+    __slots__ = ("success", "condition")
+    
+    def __init__(self, success: Any, condition: Dict[str, Any]):
+        self.success = success
+        self.condition = condition
+    
+    def __call__(self, actual: Any) -> bool:
+        if isinstance(actual, dict):
+            return actual.get("success", False) == self.success
+        return actual == self.condition
+
+
+class _ContainsMatcher:
+    # {"contains": v}: membership for dict/str results, otherwise the condition's remaining checks
+    __slots__ = ("needle", "fallback")
+    
+    def __init__(self, needle: Any, fallback: Callable[[Any], bool]):
+        self.needle = needle
+        self.fallback = fallback
+    
+    def __call__(self, actual: Any) -> bool:
+        if isinstance(actual, (dict, str)):
+            return self.needle in actual
+        return self.fallback(actual)
+
+
+def _compile_result_matcher(expected: Any) -> Callable[[Any], bool]:
+    # Same checks, in the same order, as interpreting the condition each time:
+    # "contains" for dict/str results, then "equals", then "success" for dict results, then plain equality
+    if not isinstance(expected, dict):
+        return _PlainEqMatcher(expected)
+    
+    if "equals" in expected:
+        matcher = _EqMatcher(expected["equals"])
+    elif "success" in expected:
+        matcher = _SuccessMatcher(expected["success"], expected)
+    else:
+        matcher = _PlainEqMatcher(expected)
+    
+    if "contains" in expected:
+        return _ContainsMatcher(expected["contains"], matcher)
+    return matcher
+
+
+def _compile_conditions(conditions: Mapping[str, Any]) -> Tuple[Callable[[Dict[str, Any]], bool], Tuple[str, ...]]:
+    # Returns the evaluator and the session_state keys it reads; result keys are formatted only here
+    required_state = tuple(conditions.get("required_state", {}).items())
+    required_results = tuple(
+        (f"{tool_name}_result", _compile_result_matcher(expected))
+        for tool_name, expected in conditions.get("required_results", {}).items()
+    )
+    
+    def evaluate(session_state: Dict[str, Any]) -> bool:
+        for key, expected_value in required_state:
+            if session_state.get(key) != expected_value:
+                return False
+        for result_key, matcher in required_results:
+            actual_result = session_state.get(result_key, _MISSING)
+            if actual_result is _MISSING or not matcher(actual_result):
+                return False
+        return True
+    
+    read_keys = tuple(key for key, _ in required_state) + tuple(key for key, _ in required_results)
+    return evaluate, read_keys
+
+
 class WorkflowStep:
-    tool_name: str
-    step_type: WorkflowStepType
-    dependencies: List[str]
-    conditions: Dict[str, Any]
-    approval_required: bool = False
-    timeout_seconds: Optional[int] = None
-    retry_count: int = 0
-    
-    def can_execute(self, completed_tools: List[str], failed_tools: List[str], 
+    # Immutable and slotted: steps are shared by every run of a template
+    __slots__ = ("tool_name", "step_type", "dependencies", "conditions", "approval_required",
+                 "timeout_seconds", "retry_count", "dependencies_set", "_state_dep_keys", "_evaluator",
+                 "_has_conditions", "_allow_failed")
+    
+    def __init__(self, tool_name: str, step_type: WorkflowStepType, dependencies: Iterable[str],
+                 conditions: Mapping[str, Any], approval_required: bool = False,
+                 timeout_seconds: Optional[int] = None, retry_count: int = 0):
+        init = object.__setattr__
+        init(self, "tool_name", tool_name)
+        init(self, "step_type", step_type)
+        init(self, "dependencies", tuple(dependencies))
+        init(self, "conditions", MappingProxyType(dict(conditions)))
+        init(self, "approval_required", approval_required)
+        init(self, "timeout_seconds", timeout_seconds)
+        init(self, "retry_count", retry_count)
+        init(self, "dependencies_set", frozenset(self.dependencies))
+        # _state_dep_keys are the session_state keys the conditions read, used to key cached results
+        evaluator, state_dep_keys = _compile_conditions(self.conditions)
+        init(self, "_evaluator", evaluator)
+        init(self, "_state_dep_keys", state_dep_keys)
+        # Most steps have no conditions; these flags let can_execute skip the dict lookups
+        init(self, "_has_conditions", bool(self.conditions.get("required_state") or
+                                           self.conditions.get("required_results")))
+        init(self, "_allow_failed", bool(self.conditions.get("allow_failed_dependencies", False)))
+    
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"WorkflowStep is immutable; cannot set {name}")
+    
+    def __delattr__(self, name: str):
+        raise AttributeError(f"WorkflowStep is immutable; cannot delete {name}")
+    
+    def _key(self) -> Tuple[Any, ...]:
+        return (self.tool_name, self.step_type, self.dependencies, self.conditions,
+                self.approval_required, self.timeout_seconds, self.retry_count)
+    
+    def __eq__(self, other: Any) -> bool:
+        # Field-wise, like the dataclass this replaced
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+    
+    def __hash__(self) -> int:
+        # conditions may hold nested dicts, so only the hashable identity fields are used
+        return hash((self.tool_name, self.step_type, self.dependencies))
+    
+    def __repr__(self) -> str:
+        return (f"WorkflowStep(tool_name={self.tool_name!r}, step_type={self.step_type}, "
+                f"dependencies={self.dependencies!r}, conditions={dict(self.conditions)!r}, "
+                f"approval_required={self.approval_required!r}, timeout_seconds={self.timeout_seconds!r}, "
+                f"retry_count={self.retry_count!r})")
+    
+    def can_execute(self, completed_tools: Set[str], failed_tools: Set[str], 
                    session_state: Dict[str, Any]) -> bool:
-        # Check if all dependencies are completed
-        for dep in self.dependencies:
-            if dep not in completed_tools:
-                return False
+        # Callers pass sets; membership checks below are O(1)
+        if not self.dependencies_set.issubset(completed_tools):
+            return False
         
         # Check if any dependencies failed (unless specifically allowed)
-        if not self.conditions.get("allow_failed_dependencies", False):
-            for dep in self.dependencies:
-                if dep in failed_tools:
-                    return False
+        if not self._allow_failed and not self.dependencies_set.isdisjoint(failed_tools):
+            return False
         
         # Check conditional execution
-        if self.conditions:
-            return self._evaluate_conditions(session_state)
+        if self._has_conditions:
+            return self._evaluator(session_state)
         
         return True
     
     def _evaluate_conditions(self, session_state: Dict[str, Any]) -> bool:
-        if "required_state" in self.conditions:
-            required_state = self.conditions["required_state"]
-            for key, expected_value in required_state.items():
-                if session_state.get(key) != expected_value:
-                    return False
-        
-        if "required_results" in self.conditions:
-            required_results = self.conditions["required_results"]
-            for tool_name, expected_result in required_results.items():
-                result_key = f"{tool_name}_result"
-                if result_key not in session_state:
-                    return False
-                
-                actual_result = session_state[result_key]
-                if not self._check_result_condition(actual_result, expected_result):
-                    return False
-        
-        return True
-    
-    def _check_result_condition(self, actual_result: Any, expected_condition: Any) -> bool:
-        if isinstance(expected_condition, dict):
-            if "contains" in expected_condition:
-                if isinstance(actual_result, dict):
-                    return expected_condition["contains"] in actual_result
-                elif isinstance(actual_result, str):
-                    return expected_condition["contains"] in actual_result
-            
-            if "equals" in expected_condition:
-                return actual_result == expected_condition["equals"]
-            
-            if "success" in expected_condition:
-                if isinstance(actual_result, dict):
-                    return actual_result.get("success", False) == expected_condition["success"]
-        
-        return actual_result == expected_condition
+        return self._evaluator(session_state)
 
 
 class WorkflowTemplate:
-    def __init__(self, name: str, description: str, steps: List[Dict[str, Any]]):
+    __slots__ = ("name", "description", "steps", "metadata", "parallel", "max_concurrent", "_step_index",
+                 "_tool_names", "_position", "_reverse_deps", "_indegree", "_levels", "waves")
+    
+    def __init__(self, name: str, description: str, steps: List[Dict[str, Any]],
+                 parallel: bool = False, max_concurrent: int = 4):
+        self._setup(name, description, [self._create_step(step_config) for step_config in steps],
+                    parallel, max_concurrent)
+    
+    @classmethod
+    def from_prebuilt_steps(cls, name: str, description: str, steps: Iterable[WorkflowStep],
+                            parallel: bool = False, max_concurrent: int = 4) -> "WorkflowTemplate":
+        # Steps are immutable, so templates can share them instead of rebuilding from dicts
+        template = cls.__new__(cls)
+        template._setup(name, description, list(steps), parallel, max_concurrent)
+        return template
+    
+    def _setup(self, name: str, description: str, steps: List[WorkflowStep],
+               parallel: bool, max_concurrent: int):
         self.name = name
         self.description = description
-        self.steps = [self._create_step(step_config) for step_config in steps]
+        self.steps = steps
         self.metadata = {}
+        # Only for templates whose steps do not depend on each other: execute them concurrently
+        self.parallel = parallel
+        self.max_concurrent = max_concurrent
+        # First step wins if a tool name repeats, matching the old linear scan
+        self._step_index: Dict[str, WorkflowStep] = {}
+        for step in self.steps:
+            self._step_index.setdefault(step.tool_name, step)
+        self._tool_names: FrozenSet[str] = frozenset(self._step_index)
+        self._build_schedule()
+    
+    def _build_schedule(self):
+        # Reverse adjacency and indegrees for Kahn-style scheduling; WorkflowExecutionState
+        # copies the indegrees and updates them as tools complete
+        self._position: Dict[str, int] = {}
+        for i, step in enumerate(self.steps):
+            self._position.setdefault(step.tool_name, i)
+        self._reverse_deps: Dict[str, List[WorkflowStep]] = {}
+        self._indegree: Dict[str, int] = {}
+        internal_indegree: Dict[str, int] = {}
+        for step in self.steps:
+            self._indegree[step.tool_name] = len(step.dependencies_set)
+            internal_indegree[step.tool_name] = 0
+            for dep in step.dependencies_set:
+                self._reverse_deps.setdefault(dep, []).append(step)
+                if dep in self._position:
+                    internal_indegree[step.tool_name] += 1
+        
+        # Dependencies on tools outside the template cannot form a cycle, so only count internal ones.
+        # The same pass assigns levels: 0 for steps with no internal dependencies, else 1 + deepest dependency
+        queue = [name for name, degree in internal_indegree.items() if degree == 0]
+        self._levels: Dict[str, int] = dict.fromkeys(internal_indegree, 0)
+        emitted = 0
+        while queue:
+            name = queue.pop()
+            emitted += 1
+            for dependent in self._reverse_deps.get(name, ()):
+                dependent_name = dependent.tool_name
+                self._levels[dependent_name] = max(self._levels[dependent_name], self._levels[name] + 1)
+                internal_indegree[dependent_name] -= 1
+                if internal_indegree[dependent_name] == 0:
+                    queue.append(dependent_name)
+        if emitted < len(internal_indegree):
+            cyclic = sorted(name for name, degree in internal_indegree.items() if degree > 0)
+            raise ValueError(f"Workflow template {self.name} has a dependency cycle among: {cyclic}")
+        
+        waves: List[List[WorkflowStep]] = [[] for _ in range(max(self._levels.values(), default=-1) + 1)]
+        for name, position in self._position.items():
+            waves[self._levels[name]].append(self.steps[position])
+        self.waves: Tuple[Tuple[WorkflowStep, ...], ...] = tuple(tuple(wave) for wave in waves)
+    
+    def start_execution(self) -> "WorkflowExecutionState":
+        return WorkflowExecutionState(self)
     
     def _create_step(self, step_config: Dict[str, Any]) -> WorkflowStep:
+        # Interned names let set and dict lookups across templates match on identity first
         return WorkflowStep(
-            tool_name=step_config["tool_name"],
+            tool_name=sys.intern(step_config["tool_name"]),
             step_type=WorkflowStepType(step_config.get("step_type", "sequential")),
-            dependencies=step_config.get("dependencies", []),
+            dependencies=[sys.intern(dep) for dep in step_config.get("dependencies", [])],
             conditions=step_config.get("conditions", {}),
             approval_required=step_config.get("approval_required", False),
             timeout_seconds=step_config.get("timeout_seconds"),
             retry_count=step_config.get("retry_count", 0)
         )
     
-    def get_next_executable_steps(self, completed_tools: List[str], failed_tools: List[str], 
-                                 session_state: Dict[str, Any]) -> List[WorkflowStep]:
+    def get_next_executable_steps(self, completed_tools: Iterable[str], failed_tools: Iterable[str], 
+                                 session_state: Dict[str, Any],
+                                 pending: Optional[Iterable[str]] = None) -> Tuple[WorkflowStep, ...]:
         executable_steps = []
+        completed_set = set(completed_tools)
+        failed_set = set(failed_tools)
+        # Callers that track the not-yet-finished tools can pass them to narrow the scan; names outside
+        # the template or already finished are ignored
+        pending_set = self._tool_names.difference(completed_set, failed_set)
+        if pending is not None:
+            pending_set = pending_set.intersection(pending)
         
-        for step in self.steps:
-            if step.tool_name not in completed_tools and step.tool_name not in failed_tools:
-                if step.can_execute(completed_tools, failed_tools, session_state):
-                    executable_steps.append(step)
+        step_index = self._step_index
+        for tool_name in sorted(pending_set, key=self._position.__getitem__):
+            step = step_index[tool_name]
+            if step.can_execute(completed_set, failed_set, session_state):
+                executable_steps.append(step)
         
-        return executable_steps
+        return tuple(executable_steps)
     
-    def get_progress(self, completed_tools: List[str], failed_tools: List[str]) -> Dict[str, Any]:
+    def get_progress(self, completed_tools: Iterable[str], failed_tools: Iterable[str]) -> Dict[str, Any]:
+        completed_set = self._tool_names.intersection(completed_tools)
+        failed_set = self._tool_names.intersection(failed_tools)
         total_steps = len(self.steps)
-        completed_steps = len([step for step in self.steps if step.tool_name in completed_tools])
-        failed_steps = len([step for step in self.steps if step.tool_name in failed_tools])
+        completed_steps = len(completed_set)
+        failed_steps = len(failed_set)
+        pending = self._tool_names.difference(completed_set, failed_set)
         
         return {
             "total_steps": total_steps,
@@ -118,219 +293,220 @@ class WorkflowTemplate:
             "remaining_steps": total_steps - completed_steps - failed_steps,
             "progress_percent": (completed_steps / total_steps * 100) if total_steps > 0 else 0,
             "is_complete": completed_steps == total_steps,
-            "has_failures": failed_steps > 0
+            "has_failures": failed_steps > 0,
+            # Lowest dependency level that still has unfinished steps; None once nothing is pending
+            "current_wave": min((self._levels[name] for name in pending), default=None)
         }
     
-    def is_complete(self, completed_tools: List[str]) -> bool:
-        return all(step.tool_name in completed_tools for step in self.steps)
+    def is_complete(self, completed_tools: Iterable[str]) -> bool:
+        return self._tool_names.issubset(completed_tools)
     
     def get_step_by_tool_name(self, tool_name: str) -> Optional[WorkflowStep]:
-        for step in self.steps:
-            if step.tool_name == tool_name:
-                return step
-        return None
+        return self._step_index.get(tool_name)
 
 
-class WorkflowTemplateManager:
-    def __init__(self):
-        self.templates: Dict[str, WorkflowTemplate] = {}
-        self._load_default_templates()
+# Default template steps, built once at import and shared by every WorkflowTemplateManager
+_CUSTOMER_ONBOARDING_STEPS: Tuple[WorkflowStep, ...] = (
+    WorkflowStep("validate_data", WorkflowStepType.SEQUENTIAL, (), {}),
+    WorkflowStep("process_data", WorkflowStepType.SEQUENTIAL, ("validate_data",),
+                 {"required_results": {"validate_data": {"success": True}}}),
+    WorkflowStep("backup_data", WorkflowStepType.SEQUENTIAL, ("process_data",),
+                 {"required_results": {"process_data": {"success": True}}}),
+    WorkflowStep("send_notification", WorkflowStepType.SEQUENTIAL, ("backup_data",), {})
+)
+
+_FINANCIAL_PROCESSING_STEPS: Tuple[WorkflowStep, ...] = (
+    WorkflowStep("validate_data", WorkflowStepType.SEQUENTIAL, (), {}),
+    WorkflowStep("require_approval", WorkflowStepType.APPROVAL_GATE, ("validate_data",),
+                 {"required_results": {"validate_data": {"success": True}}}, approval_required=True),
+    WorkflowStep("process_data", WorkflowStepType.SEQUENTIAL, ("require_approval",),
+                 {"required_results": {"require_approval": {"approved": True}}}),
+    WorkflowStep("backup_data", WorkflowStepType.PARALLEL, ("process_data",), {}),
+    WorkflowStep("send_notification", WorkflowStepType.PARALLEL, ("process_data",), {})
+)
+
+_DATA_PIPELINE_STEPS: Tuple[WorkflowStep, ...] = (
+    WorkflowStep("validate_data", WorkflowStepType.SEQUENTIAL, (), {}, timeout_seconds=60),
+    WorkflowStep("process_data", WorkflowStepType.SEQUENTIAL, ("validate_data",),
+                 {"required_results": {"validate_data": {"valid": True}}}, timeout_seconds=300),
+    WorkflowStep("backup_data", WorkflowStepType.SEQUENTIAL, ("process_data",), {}, timeout_seconds=120)
+)
+
+_EMERGENCY_RESPONSE_STEPS: Tuple[WorkflowStep, ...] = (
+    WorkflowStep("send_notification", WorkflowStepType.SEQUENTIAL, (), {}),
+    WorkflowStep("validate_data", WorkflowStepType.PARALLEL, (), {}, timeout_seconds=30),
+    WorkflowStep("process_data", WorkflowStepType.SEQUENTIAL, ("validate_data",), {"allow_failed_dependencies": True}),
+    WorkflowStep("backup_data", WorkflowStepType.SEQUENTIAL, ("process_data",), {})
+)
+
+_DEFAULT_TEMPLATES = (
+    ("customer_onboarding",
+     "Complete customer onboarding process with validation, processing, backup, and notification",
+     _CUSTOMER_ONBOARDING_STEPS),
+    ("financial_processing",
+     "Secure financial processing with fraud check, approval, and audit trail",
+     _FINANCIAL_PROCESSING_STEPS),
+    ("data_pipeline",
+     "ETL data pipeline with validation, processing, and monitoring",
+     _DATA_PIPELINE_STEPS),
+    ("emergency_response",
+     "Emergency response workflow with immediate notification and approval bypass",
+     _EMERGENCY_RESPONSE_STEPS)
+)
+
+
+class WorkflowExecutionState:
+    """Incremental ready set for one run of a template."""
     
-    def _load_default_templates(self):
-        # Customer Onboarding Workflow
-        customer_onboarding = WorkflowTemplate(
-            name="customer_onboarding",
-            description="Complete customer onboarding process with validation, processing, backup, and notification",
-            steps=[
-                {
-                    "tool_name": "validate_data",
-                    "step_type": "sequential",
-                    "dependencies": [],
-                    "conditions": {}
-                },
-                {
-                    "tool_name": "process_data",
-                    "step_type": "sequential",
-                    "dependencies": ["validate_data"],
-                    "conditions": {
-                        "required_results": {
-                            "validate_data": {"success": True}
-                        }
-                    }
-                },
-                {
-                    "tool_name": "backup_data",
-                    "step_type": "sequential",
-                    "dependencies": ["process_data"],
-                    "conditions": {
-                        "required_results": {
-                            "process_data": {"success": True}
-                        }
-                    }
-                },
-                {
-                    "tool_name": "send_notification",
-                    "step_type": "sequential",
-                    "dependencies": ["backup_data"],
-                    "conditions": {}
-                }
-            ]
-        )
-        
-        # Financial Processing Workflow
-        financial_processing = WorkflowTemplate(
-            name="financial_processing",
-            description="Secure financial processing with fraud check, approval, and audit trail",
-            steps=[
-                {
-                    "tool_name": "validate_data",
-                    "step_type": "sequential",
-                    "dependencies": [],
-                    "conditions": {}
-                },
-                {
-                    "tool_name": "require_approval",
-                    "step_type": "approval_gate",
-                    "dependencies": ["validate_data"],
-                    "conditions": {
-                        "required_results": {
-                            "validate_data": {"success": True}
-                        }
-                    },
-                    "approval_required": True
-                },
-                {
-                    "tool_name": "process_data",
-                    "step_type": "sequential",
-                    "dependencies": ["require_approval"],
-                    "conditions": {
-                        "required_results": {
-                            "require_approval": {"approved": True}
-                        }
-                    }
-                },
-                {
-                    "tool_name": "backup_data",
-                    "step_type": "parallel",
-                    "dependencies": ["process_data"],
-                    "conditions": {}
-                },
-                {
-                    "tool_name": "send_notification",
-                    "step_type": "parallel",
-                    "dependencies": ["process_data"],
-                    "conditions": {}
-                }
-            ]
-        )
-        
-        # Data Pipeline Workflow
-        data_pipeline = WorkflowTemplate(
-            name="data_pipeline",
-            description="ETL data pipeline with validation, processing, and monitoring",
-            steps=[
-                {
-                    "tool_name": "validate_data",
-                    "step_type": "sequential",
-                    "dependencies": [],
-                    "conditions": {},
-                    "timeout_seconds": 60
-                },
-                {
-                    "tool_name": "process_data",
-                    "step_type": "sequential",
-                    "dependencies": ["validate_data"],
-                    "conditions": {
-                        "required_results": {
-                            "validate_data": {"valid": True}
-                        }
-                    },
-                    "timeout_seconds": 300
-                },
-                {
-                    "tool_name": "backup_data",
-                    "step_type": "sequential",
-                    "dependencies": ["process_data"],
-                    "conditions": {},
-                    "timeout_seconds": 120
-                }
-            ]
+    __slots__ = ("template", "indegree", "ready", "completed", "failed", "state_versions",
+                 "_condition_cache")
+    
+    def __init__(self, template: WorkflowTemplate):
+        self.template = template
+        self.indegree = dict(template._indegree)
+        self.ready: Set[str] = {name for name, degree in self.indegree.items() if degree == 0}
+        self.completed: Set[str] = set()
+        self.failed: Set[str] = set()
+        # Per-run condition cache; tool -> (versions of the state keys it read, the values read, result)
+        self.state_versions: Dict[str, int] = {}
+        self._condition_cache: Dict[str, Tuple[Tuple[int, ...], Tuple[Any, ...], bool]] = {}
+    
+    def notify_state_changed(self, *keys: str):
+        # Callers must report in-place session_state edits so cached condition results are dropped
+        for key in keys:
+            self.state_versions[key] = self.state_versions.get(key, 0) + 1
+    
+    def mark_completed(self, tool_name: str) -> List[str]:
+        # Returns the tools this completion made ready
+        if tool_name in self.completed:
+            return []
+        self.completed.add(tool_name)
+        self.ready.discard(tool_name)
+        # The tool's result is usually written around now, so conditions on it are re-checked
+        self._bump_result_version(tool_name)
+        newly_ready = []
+        for dependent in self.template._reverse_deps.get(tool_name, ()):
+            name = dependent.tool_name
+            self.indegree[name] -= 1
+            if self.indegree[name] == 0 and name not in self.completed and name not in self.failed:
+                self.ready.add(name)
+                newly_ready.append(name)
+        return newly_ready
+    
+    def notify_completed(self, tool_name: str, session_state: Dict[str, Any]) -> Tuple[WorkflowStep, ...]:
+        # Only looks at the completed tool's dependents. A newly ready step whose conditions fail now
+        # stays in the ready set and shows up in get_next_executable_steps once the state allows it
+        newly_ready = self.mark_completed(tool_name)
+        step_index = self.template._step_index
+        newly_ready.sort(key=self.template._position.__getitem__)
+        return tuple(
+            step_index[name] for name in newly_ready if self._can_execute(step_index[name], session_state)
         )
-        
-        # Emergency Response Workflow
-        emergency_response = WorkflowTemplate(
-            name="emergency_response",
-            description="Emergency response workflow with immediate notification and approval bypass",
-            steps=[
-                {
-                    "tool_name": "send_notification",
-                    "step_type": "sequential",
-                    "dependencies": [],
-                    "conditions": {}
-                },
-                {
-                    "tool_name": "validate_data",
-                    "step_type": "parallel",
-                    "dependencies": [],
-                    "conditions": {},
-                    "timeout_seconds": 30
-                },
-                {
-                    "tool_name": "process_data",
-                    "step_type": "sequential",
-                    "dependencies": ["validate_data"],
-                    "conditions": {
-                        "allow_failed_dependencies": True
-                    }
-                },
-                {
-                    "tool_name": "backup_data",
-                    "step_type": "sequential",
-                    "dependencies": ["process_data"],
-                    "conditions": {}
-                }
-            ]
+    
+    def mark_failed(self, tool_name: str):
+        self.failed.add(tool_name)
+        self.ready.discard(tool_name)
+        self._bump_result_version(tool_name)
+    
+    def _bump_result_version(self, tool_name: str):
+        key = f"{tool_name}_result"
+        self.state_versions[key] = self.state_versions.get(key, 0) + 1
+    
+    def get_next_executable_steps(self, session_state: Dict[str, Any]) -> Tuple[WorkflowStep, ...]:
+        # Only steps whose dependencies are all complete are considered; keep template order.
+        # Evaluated against the state passed in; the per-step condition cache does the saving
+        step_index = self.template._step_index
+        ready = sorted(self.ready, key=self.template._position.__getitem__)
+        return tuple(
+            step_index[name] for name in ready if self._can_execute(step_index[name], session_state)
         )
+    
+    def _can_execute(self, step: WorkflowStep, session_state: Dict[str, Any]) -> bool:
+        if not step._allow_failed and not step.dependencies_set.isdisjoint(self.failed):
+            return False
+        if not step._has_conditions:
+            return True
         
-        self.templates["customer_onboarding"] = customer_onboarding
-        self.templates["financial_processing"] = financial_processing
-        self.templates["data_pipeline"] = data_pipeline
-        self.templates["emergency_response"] = emergency_response
+        # Versions catch reported in-place edits; the values themselves catch unreported reassignment
+        keys = step._state_dep_keys
+        versions = tuple(self.state_versions.get(key, 0) for key in keys)
+        values = tuple(session_state.get(key, _MISSING) for key in keys)
+        cached = self._condition_cache.get(step.tool_name)
+        if (cached is not None and cached[0] == versions
+                and all(value is seen for value, seen in zip(values, cached[1]))):
+            return cached[2]
+        result = step._evaluate_conditions(session_state)
+        self._condition_cache[step.tool_name] = (versions, values, result)
+        return result
+    
+    def is_complete(self) -> bool:
+        return self.template._tool_names.issubset(self.completed)
+
+
+class WorkflowTemplateManager:
+    __slots__ = ("_templates", "version", "_listing_cache", "_defaults_loaded")
+    
+    def __init__(self, load_defaults: bool = True):
+        self._templates: Dict[str, WorkflowTemplate] = {}
+        # Bumped on every add/remove so callers can cache views of the template set
+        self.version = 0
+        # Built on first list_templates() call, dropped on add/remove
+        self._listing_cache: Optional[Tuple[Dict[str, str], ...]] = None
+        # Default templates are built on first access rather than on construction
+        self._defaults_loaded = not load_defaults
+    
+    @property
+    def templates(self) -> Dict[str, WorkflowTemplate]:
+        if not self._defaults_loaded:
+            self._defaults_loaded = True
+            self._load_default_templates()
+        return self._templates
+    
+    def _load_default_templates(self):
+        for name, description, steps in _DEFAULT_TEMPLATES:
+            self._templates[name] = WorkflowTemplate.from_prebuilt_steps(name, description, steps)
     
     def get_template(self, name: str) -> Optional[WorkflowTemplate]:
         return self.templates.get(name)
     
-    def list_templates(self) -> List[Dict[str, str]]:
-        return [
-            {"name": name, "description": template.description}
-            for name, template in self.templates.items()
-        ]
+    def list_templates(self) -> Tuple[Dict[str, str], ...]:
+        # Built once per template set; each caller gets its own copy of the entries to edit freely
+        if self._listing_cache is None:
+            self._listing_cache = tuple(
+                {"name": name, "description": template.description}
+                for name, template in self.templates.items()
+            )
+        return tuple(dict(entry) for entry in self._listing_cache)
     
     def add_template(self, template: WorkflowTemplate):
         self.templates[template.name] = template
+        self.version += 1
+        self._listing_cache = None
     
     def remove_template(self, name: str) -> bool:
         if name in self.templates:
             del self.templates[name]
+            self.version += 1
+            self._listing_cache = None
             return True
         return False
     
-    def get_template_progress(self, template_name: str, completed_tools: List[str], 
-                            failed_tools: List[str]) -> Dict[str, Any]:
+    def get_template_progress(self, template_name: str, completed_tools: Iterable[str], 
+                            failed_tools: Iterable[str]) -> Dict[str, Any]:
         template = self.get_template(template_name)
         if not template:
             return {"error": "Template not found"}
         
         return template.get_progress(completed_tools, failed_tools)
     
-    def get_next_steps(self, template_name: str, completed_tools: List[str], 
-                      failed_tools: List[str], session_state: Dict[str, Any]) -> List[str]:
+    def get_next_steps(self, template_name: str, completed_tools: Iterable[str], 
+                      failed_tools: Iterable[str], session_state: Dict[str, Any]) -> Tuple[str, ...]:
         template = self.get_template(template_name)
         if not template:
-            return []
+            return ()
         
         executable_steps = template.get_next_executable_steps(completed_tools, failed_tools, session_state)
-        return [step.tool_name for step in executable_steps]
+        return tuple(step.tool_name for step in executable_steps)
     
     def validate_workflow_sequence(self, template_name: str, tool_sequence: List[str]) -> Dict[str, Any]:
         template = self.get_template(template_name)
@@ -339,18 +515,22 @@ class WorkflowTemplateManager:
         
         errors = []
         completed_tools = []
+        completed_set: Set[str] = set()
+        step_index = template._step_index
         
+        # Structural check only: the order must satisfy dependencies; conditions need real results
         for tool_name in tool_sequence:
-            step = template.get_step_by_tool_name(tool_name)
+            step = step_index.get(tool_name)
             if not step:
                 errors.append(f"Tool {tool_name} not found in template")
                 continue
             
-            if not step.can_execute(completed_tools, [], {}):
-                missing_deps = [dep for dep in step.dependencies if dep not in completed_tools]
+            if not step.dependencies_set.issubset(completed_set):
+                missing_deps = [dep for dep in step.dependencies if dep not in completed_set]
                 errors.append(f"Tool {tool_name} missing dependencies: {missing_deps}")
             
             completed_tools.append(tool_name)
+            completed_set.add(tool_name)
         
         return {
             "valid": len(errors) == 0,